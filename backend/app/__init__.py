@@ -1,43 +1,81 @@
 # App factory: creates and configures the Flask app, registers extensions and blueprints
 from flask import Flask
+from sqlalchemy.orm import configure_mappers
 from .config import Config
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
-from flask_cors import CORS
+from app.utils.cors import init_cors
+from app.utils.json_provider import init_json_provider
 
 # Extensions (initialized later)
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
 
+# Blueprints are imported once here, after the extensions they depend on exist,
+# instead of on every create_app() call
+from app.routes.auth import auth_bp
+from app.routes.user import user_bp
+from app.routes.image import image_bp
+from app.models.user import configure_password_hasher
+from app.cli import init_cli
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    # Fast orjson-based encoding for jsonify() responses
+    init_json_provider(app)
 
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
 
-    # CORS setup: handles all CORS headers, preflight, credentials, and common issues
-    CORS(
-        app,
-        resources={r"/api/*": {"origins": "*"}},  # In production, set to your frontend URL
-        supports_credentials=True,
-        allow_headers=[
-            "Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"
-        ],
-        methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        expose_headers=["Content-Disposition"]  # For file downloads if needed
+    # Password hashing cost from config
+    configure_password_hasher(
+        time_cost=app.config.get("ARGON2_TIME_COST", 2),
+        memory_cost=app.config.get("ARGON2_MEMORY_COST", 65536),
+        parallelism=app.config.get("ARGON2_PARALLELISM", 2),
     )
 
+    # Operational CLI commands (e.g. `flask calibrate-password-hash`)
+    init_cli(app)
+
+    # CORS setup: precomputed headers for /api/* and short-circuited preflights
+    init_cors(app)
+
+    # Match routes with or without a trailing slash instead of redirecting
+    app.url_map.strict_slashes = False
+
     # Register blueprints
-    from app.routes.auth import auth_bp
-    from app.routes.user import user_bp
-    from app.routes.image import image_bp
     app.register_blueprint(auth_bp, url_prefix="/api/v1/auth")
     app.register_blueprint(user_bp, url_prefix="/api/v1/users")
     app.register_blueprint(image_bp, url_prefix="/api/v1/images")
 
+    _warm_up(app)
+
     return app
+
+
+def _warm_up(app):
+    """
+    Do one-time lazy setup up front so the first request doesn't pay for it.
+    Under `gunicorn --preload` this runs once in the master process and the
+    result is shared with every forked worker.
+    Schemas are already built at import time by the controllers.
+    """
+    # Create the Flask logger and its default handler up front; module-level
+    # loggers under "app.*" propagate to it
+    app.logger.debug("Warming up application")
+    with app.app_context():
+        configure_mappers()
+        try:
+            # First connect runs dialect initialization (server version, etc.)
+            with db.engine.connect():
+                pass
+        except Exception as e:
+            app.logger.warning("Database warm-up skipped: %s", e)
+        finally:
+            # Never hand pooled connections to forked workers
+            db.engine.dispose()
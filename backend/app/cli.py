@@ -0,0 +1,19 @@
+# Flask CLI commands for operating the app (`flask <command>`)
+import click
+from app.models.user import calibrate_time_cost
+
+
+def init_cli(app):
+    """Register the app's CLI commands."""
+
+    @app.cli.command("calibrate-password-hash")
+    @click.option("--target-ms", default=250, show_default=True,
+                  help="Minimum hashing time to aim for.")
+    def calibrate_password_hash(target_ms):
+        """Find the ARGON2_TIME_COST that takes at least TARGET_MS on this host."""
+        time_cost = calibrate_time_cost(
+            target_ms,
+            memory_cost=app.config.get("ARGON2_MEMORY_COST", 65536),
+            parallelism=app.config.get("ARGON2_PARALLELISM", 2),
+        )
+        click.echo(f"ARGON2_TIME_COST={time_cost}")
@@ -5,7 +5,26 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # Connection pool tuning for concurrent workers
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 20)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 40)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
+    # argon2id password hashing cost; run `flask calibrate-password-hash` on the
+    # production host to pick ARGON2_TIME_COST for a target hashing latency
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 2))
+    # Concurrent password hashes per worker process (0: one per CPU); with
+    # several workers on a host, divide the CPUs between them
+    PASSWORD_HASH_THREADS = int(os.getenv("PASSWORD_HASH_THREADS", 0))
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")  # Use at least 32 random bytes for HS256
+    JWT_ALGORITHM = "HS256"
+    JWT_DECODE_LEEWAY = 0
+    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")  # Comma-separated; set to your frontend URL in production
     S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
     S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY")
     S3_SECRET_KEY = os.getenv("S3_SECRET_KEY")
@@ -13,3 +32,13 @@ class Config:
     S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
     CLARIFAI_PAT = os.getenv("CLARIFAI_PAT")
     CLARIFAI_WORKFLOW_URL = os.getenv("CLARIFAI_WORKFLOW_URL")
+    # Concurrent analyses are coalesced into workflow calls of up to this many
+    # images, waiting at most the timeout for a batch to fill; 1 disables batching
+    CLARIFAI_BATCH_SIZE = int(os.getenv("CLARIFAI_BATCH_SIZE", 16))
+    CLARIFAI_BATCH_TIMEOUT_MS = int(os.getenv("CLARIFAI_BATCH_TIMEOUT_MS", 30))
+    # Analyses still pending after this long are assumed lost (e.g. their worker
+    # restarted) and re-submitted; each worker checks at the given interval
+    ANALYSIS_STALE_AFTER_SECONDS = int(os.getenv("ANALYSIS_STALE_AFTER_SECONDS", 600))
+    ANALYSIS_SWEEP_INTERVAL_SECONDS = int(os.getenv("ANALYSIS_SWEEP_INTERVAL_SECONDS", 60))
+    # Attach the full workflow response to analysis results (costly; debugging only)
+    DEBUG_CLARIFAI = os.getenv("DEBUG_CLARIFAI", "false").lower() == "true"
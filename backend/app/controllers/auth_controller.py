@@ -2,7 +2,13 @@ from marshmallow import ValidationError
 from app.schemas.user_login_schema import UserLoginSchema
 from app.schemas.user_registration_schema import UserRegistrationSchema
 from app.services.user_service import UserService
-from app.schemas.user_schema import UserSchema
+from app.schemas.user_schema import UserSchema, dump_user_profile
+
+# Schema instances are stateless between calls, so build them once at import
+# instead of re-walking field/model metadata on every request
+_USER_SCHEMA = UserSchema()
+_USER_LOGIN_SCHEMA = UserLoginSchema()
+_USER_REG_SCHEMA = UserRegistrationSchema()
 
 def login_user(request_data):
     """
@@ -11,17 +17,16 @@ def login_user(request_data):
     - Pass validated data dict to UserService.authenticate_user
     - Return user data and JWT or error message
     """
-    schema = UserLoginSchema()
     try:
-        validated_data = schema.load(request_data)
+        validated_data = _USER_LOGIN_SCHEMA.load(request_data)
     except ValidationError as err:
         return {"errors": err.messages}, 400
 
-    user, access_token, error = UserService.authenticate_user(validated_data)
+    profile, access_token, error = UserService.authenticate_user(validated_data)
     if error:
         return {"errors": error}, 401
 
-    user_data = UserSchema().dump(user)
+    user_data = dump_user_profile(profile)
     return {"user": user_data, "access_token": access_token}, 200
 
 
@@ -32,9 +37,8 @@ def register_user(request_data):
     - Call UserService.register_user
     - Return serialized user or error message
     """
-    schema = UserRegistrationSchema()
     try:
-        validated_data = schema.load(request_data)
+        validated_data = _USER_REG_SCHEMA.load(request_data)
     except ValidationError as err:
         return {"errors": err.messages}, 400
 
@@ -42,5 +46,5 @@ def register_user(request_data):
     if error:
         return {"errors": error}, 409
 
-    user_data = UserSchema().dump(user)
+    user_data = _USER_SCHEMA.dump(user)
     return {"user": user_data, "access_token": access_token}, 201
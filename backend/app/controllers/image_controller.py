@@ -1,5 +1,35 @@
 from app.services.image_service import ImageService
-from app.schemas.image_schema import ImageSchema
+from app.schemas.image_schema import ImageSchema, get_presigned_url
+
+# Shared schema instances, built once at import rather than per request
+_IMAGE_DETAIL_SCHEMA = ImageSchema()
+
+# Upper bound for the ?limit= query parameter on the list endpoint
+MAX_PAGE_SIZE = 100
+
+# Upper bound for the number of files in one bulk upload request
+MAX_BULK_UPLOAD_FILES = 50
+
+
+def _dump_image_row(row):
+    """
+    Serialize one projected image row for list responses.
+    The list shape is fixed, so a plain dict build replaces Marshmallow's
+    per-field dispatch on this hot path; it matches ImageSchema's output
+    for the same fields.
+    """
+    return {
+        "id": row.id,
+        "original_filename": row.original_filename,
+        "s3_key": row.s3_key,
+        "s3_url": get_presigned_url(row.s3_key),
+        "upload_date": row.upload_date.isoformat() if row.upload_date else None,
+        "file_size": row.file_size,
+        "file_type": row.file_type,
+        "ai_description": row.ai_description,
+        "analysis_status": row.analysis_status,
+    }
+
 
 def upload_image(user_id, file_storage, metadata=None):
     """
@@ -16,7 +46,8 @@ def upload_image(user_id, file_storage, metadata=None):
         
     Returns:
         tuple: (response_data, http_status_code)
-            - On success: (serialized_image, 201)
+            - On success: (serialized_image, 202); AI analysis continues in the
+              background and can be polled with get_image_analysis
             - On failure: (error_dict, 400)
     """
     # Basic input validation
@@ -44,8 +75,45 @@ def upload_image(user_id, file_storage, metadata=None):
         return {"errors": error}, 400
     
     # Serialize the model for API response using schema
-    image_data = ImageSchema().dump(image)
-    return image_data, 201
+    image_data = _IMAGE_DETAIL_SCHEMA.dump(image)
+    return image_data, 202
+
+
+def bulk_upload_images(user_id, file_storages):
+    """
+    Controller function that handles multi-file upload requests.
+    The files are stored concurrently and analyzed together in batched
+    AI calls, instead of one upload request per file.
+    
+    Args:
+        user_id (int): User ID from JWT authentication
+        file_storages (list): File objects from Flask's request.files
+        
+    Returns:
+        tuple: (response_data, http_status_code)
+            - On success: ({"images": [...], "errors": [...]}, 202); errors
+              lists the files that were rejected or could not be stored, and AI analysis of
+              the stored ones continues in the background
+            - On failure: (error_dict, 400)
+    """
+    # Basic input validation
+    file_storages = [f for f in file_storages if f]
+    if not file_storages:
+        return {"errors": "No file provided."}, 400
+    if len(file_storages) > MAX_BULK_UPLOAD_FILES:
+        return {"errors": f"At most {MAX_BULK_UPLOAD_FILES} files can be uploaded at once."}, 400
+    
+    image_service = ImageService()
+    images, errors = image_service.bulk_upload(
+        user_id=user_id,
+        files=[(f, f.filename, f.mimetype) for f in file_storages]
+    )
+    
+    # Nothing could be stored
+    if not images:
+        return {"errors": errors}, 400
+    
+    return {"images": _IMAGE_DETAIL_SCHEMA.dump(images, many=True), "errors": errors}, 202
 
 
 def get_image(user_id, image_id):
@@ -72,30 +140,63 @@ def get_image(user_id, image_id):
         return {"errors": "Image not found."}, 404
         
     # Serialize the model for API response
-    image_data = ImageSchema().dump(image)
+    image_data = _IMAGE_DETAIL_SCHEMA.dump(image)
     return image_data, 200
 
 
-def get_all_images(user_id):
+def get_image_analysis(user_id, image_id):
+    """
+    Controller function that reports the AI analysis state of an image,
+    for clients polling after an upload.
+    
+    Args:
+        user_id (int): User ID from JWT authentication
+        image_id (int): ID of the image
+        
+    Returns:
+        tuple: (response_data, http_status_code)
+            - On success: ({id, analysis_status, ai_description}, 200)
+            - On failure: (error_dict, 404)
+    """
+    image_service = ImageService()
+    image = image_service.get_image(user_id, image_id)
+    if not image:
+        return {"errors": "Image not found."}, 404
+    return {
+        "id": image.id,
+        "analysis_status": image.analysis_status,
+        "ai_description": image.ai_description,
+    }, 200
+
+
+def get_all_images(user_id, limit=None, offset=0):
     """
     Controller function that retrieves all images belonging to a user.
     Provides collection pagination capabilities.
     
     Args:
         user_id (int): User ID from JWT authentication
+        limit (int, optional): Page size, capped at MAX_PAGE_SIZE
+        offset (int, optional): Number of images to skip
         
     Returns:
         tuple: (response_data, http_status_code)
-            - Always returns: (serialized_images, 200)
+            - On success: (serialized_images, 200)
             - Empty list if user has no images
+            - On invalid pagination values: (error_dict, 400)
     """
+    if (limit is not None and limit < 1) or offset < 0:
+        return {"errors": "limit must be positive and offset must not be negative."}, 400
+    if limit is not None:
+        limit = min(limit, MAX_PAGE_SIZE)
+
     image_service = ImageService()
     
-    # Get all images for the user
-    images = image_service.list_user_images(user_id)
+    # Get the user's images, optionally paginated
+    images = image_service.list_user_images(user_id, limit=limit, offset=offset)
     
-    # Serialize collection of models (many=True)
-    image_data = ImageSchema(many=True).dump(images)
+    # Serialize the projected rows with the fixed-shape list serializer
+    image_data = [_dump_image_row(row) for row in images]
     return image_data, 200
 
 
@@ -1,6 +1,5 @@
-from app.schemas.user_schema import UserSchema
 from app.services.user_service import UserService
-
+from app.schemas.user_schema import dump_user_profile
 
 def get_user_profile(user_id):
     """
@@ -8,20 +7,23 @@ def get_user_profile(user_id):
     - Calls UserService.get_user_profile
     - Returns serialized user or error message
     """
-    user = UserService.get_user_profile(user_id)
-    if not user:
+    profile = UserService.get_user_profile(user_id)
+    if not profile:
         return {"errors": "User not found."}, 404
-    user_data = UserSchema().dump(user)
-    return user_data, 200
+    return dump_user_profile(profile), 200
 
 
-""" def list_users():
+""" def list_users(after_id=0, limit=100):
     \"\"\"
-    Controller logic to list all users.
-    - Calls UserService.list_users
-    - Returns a list of serialized users
+    Controller logic to list users, one keyset page at a time.
+    - Calls UserService.list_users (limit is capped at MAX_USER_PAGE_SIZE)
+    - Returns serialized users and the cursor for the next page,
+      or a 400 error for a non-positive limit
     \"\"\"
-    users = UserService.list_users()
+    # Needs: from app.schemas.user_schema import UserSchema
+    try:
+        users, next_after_id = UserService.list_users(after_id=after_id, limit=limit)
+    except ValueError as err:
+        return {"errors": str(err)}, 400
     user_data = UserSchema(many=True).dump(users)
-    return user_data, 200 """
-
+    return {"users": user_data, "next": next_after_id}, 200 """
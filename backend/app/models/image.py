@@ -9,11 +9,17 @@ class Image(db.Model):
     Key features:
     - Stores both original and storage metadata
     - Maintains user ownership for access control
-    - Includes AI-generated description from image analysis
+    - Includes AI-generated description from image analysis, filled in by a
+      background task (analysis_status tracks its progress)
     - Tracks file metadata like size and content type
     """
     __tablename__ = 'images'
     
+    # Values of analysis_status
+    ANALYSIS_PENDING = 'pending'
+    ANALYSIS_COMPLETE = 'complete'
+    ANALYSIS_FAILED = 'failed'
+    
     # Primary key and identifying fields
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)  # Storage filename (includes path)
@@ -27,6 +33,12 @@ class Image(db.Model):
     file_size = db.Column(db.Integer)  # Size in bytes
     file_type = db.Column(db.String(50))  # MIME type
     ai_description = db.Column(db.Text, nullable=True)  # AI-generated content description
+    analysis_status = db.Column(
+        db.String(20), nullable=False, default=ANALYSIS_PENDING, server_default=ANALYSIS_COMPLETE
+    )  # Progress of the background AI analysis
+    analysis_started_at = db.Column(
+        db.DateTime, nullable=True, default=datetime.utcnow
+    )  # When the current analysis attempt was submitted
     
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Owner reference
@@ -34,3 +46,10 @@ class Image(db.Model):
     def __repr__(self):
         """String representation of the Image model for debugging and logging"""
         return f'<Image {self.original_filename}>'
+
+
+# Composite index for the hot "list a user's images, newest first" query
+db.Index('ix_images_user_id_upload_date', Image.user_id, Image.upload_date.desc())
+
+# Index for the sweep that finds analyses left pending by a lost worker
+db.Index('ix_images_analysis_status_started_at', Image.analysis_status, Image.analysis_started_at)
@@ -1,7 +1,93 @@
+import os
+import time
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from werkzeug.security import check_password_hash
 from app import db
 
+# Shared argon2id hasher; argon2-cffi releases the GIL while hashing, so
+# concurrent logins on different threads run in parallel. Its cost is
+# replaced from config by configure_password_hasher.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+ARGON2_PREFIX = "$argon2"
+
+# Upper bound for calibration, far beyond any interactive latency
+MAX_CALIBRATION_TIME_COST = 32
+
+# Hash of a random password with the current parameters, created on first use;
+# logins naming no existing user are checked against it to take as long as real ones
+_dummy_hash = None
+
+
+def configure_password_hasher(time_cost=2, memory_cost=65536, parallelism=2):
+    """
+    Replace the shared hasher's cost parameters. Existing hashes keep
+    verifying with their own parameters and are upgraded on the next login.
+    """
+    global _password_hasher, _dummy_hash
+    _dummy_hash = None
+    _password_hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+
+def verify_dummy_password(password):
+    """
+    Spend as long as checking a password against a real argon2 hash, without
+    any user; always False. Used when a login names no existing user.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = _password_hasher.hash(os.urandom(16).hex())
+    try:
+        _password_hasher.verify(_dummy_hash, password)
+    except (VerificationError, InvalidHashError):
+        pass
+    return False
+
+
+def hash_password(password):
+    """Return a new argon2 hash of a password with the current parameters."""
+    return _password_hasher.hash(password)
+
+
+def verify_password_hash(password_hash, password):
+    """
+    Check a password against a stored hash value, argon2 or legacy Werkzeug.
+    Works on the plain string, so it can run off the request thread without
+    touching a User instance.
+    """
+    # Hashes created before the argon2 switch are Werkzeug (scrypt/pbkdf2) hashes
+    if not password_hash.startswith(ARGON2_PREFIX):
+        return check_password_hash(password_hash, password)
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_hash_needs_rehash(password_hash):
+    """True if a stored hash is legacy or uses outdated argon2 parameters."""
+    if not password_hash.startswith(ARGON2_PREFIX):
+        return True
+    return _password_hasher.check_needs_rehash(password_hash)
+
+
+def calibrate_time_cost(target_ms, memory_cost=65536, parallelism=2):
+    """
+    Return the smallest argon2 time cost whose hash takes at least target_ms
+    on this machine, increasing it one pass at a time.
+    Meant to be run once per deployment target rather than at startup, since
+    workers calibrating to different costs would keep rehashing each other's
+    hashes on login.
+    """
+    for time_cost in range(1, MAX_CALIBRATION_TIME_COST + 1):
+        hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        if (time.perf_counter() - start) * 1000 >= target_ms:
+            return time_cost
+    return MAX_CALIBRATION_TIME_COST
+
 class User(db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -13,10 +99,14 @@ class User(db.Model):
     images = db.relationship('Image', backref='owner', lazy=True, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password_hash(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """True if the stored hash is legacy or uses outdated argon2 parameters."""
+        return password_hash_needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f'<User {self.username}>'
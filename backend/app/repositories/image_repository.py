@@ -8,9 +8,16 @@ from specific database implementation details, facilitating:
 2. Easier unit testing through potential mocking
 3. Simplified switching of data sources if needed
 """
+from sqlalchemy import bindparam, or_
 from app.models.image import Image
 from app import db
 
+# Prebuilt statements for hot lookups; SQLAlchemy caches their compiled SQL
+_STMT_IMG_BY_ID_USER = db.select(Image).where(
+    Image.id == bindparam("iid"),
+    Image.user_id == bindparam("uid")
+)
+
 class ImageRepository:
     """
     Repository class for encapsulating storage, retrieval, and search operations
@@ -29,7 +36,7 @@ class ImageRepository:
         Returns:
             Image: Image instance if found, None otherwise
         """
-        return Image.query.get(image_id)
+        return db.session.get(Image, image_id)
     
     @staticmethod
     def get_by_id_and_user(image_id, user_id):
@@ -44,21 +51,45 @@ class ImageRepository:
         Returns:
             Image: Image instance if found and owned by user, None otherwise
         """
-        return Image.query.filter_by(id=image_id, user_id=user_id).first()
+        return db.session.execute(
+            _STMT_IMG_BY_ID_USER, {"iid": image_id, "uid": user_id}
+        ).scalar_one_or_none()
 
     @staticmethod
-    def list_by_user(user_id):
+    def list_by_user(user_id, limit=None, offset=0):
         """
-        List all images belonging to a specific user.
+        List images belonging to a specific user, newest first.
         Provides data filtering at the repository level for security.
+        Only the columns needed by list views are selected, so rows are
+        returned as lightweight tuples instead of hydrated ORM objects.
+        The (user_id, upload_date) index serves both the filter and the ordering.
         
         Args:
             user_id: ID of the user whose images to retrieve
+            limit: Maximum number of rows to return (None for all)
+            offset: Number of rows to skip for pagination
             
         Returns:
-            list: Collection of Image instances for the user
+            list: Collection of rows (id, original_filename, s3_key, upload_date,
+                  file_size, file_type, ai_description, analysis_status) for the user
         """
-        return Image.query.filter_by(user_id=user_id).all()
+        stmt = (
+            db.select(
+                Image.id,
+                Image.original_filename,
+                Image.s3_key,
+                Image.upload_date,
+                Image.file_size,
+                Image.file_type,
+                Image.ai_description,
+                Image.analysis_status
+            )
+            .where(Image.user_id == user_id)
+            .order_by(Image.upload_date.desc(), Image.id.desc())
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit).offset(offset)
+        return db.session.execute(stmt).all()
 
     @staticmethod
     def create(image):
@@ -75,6 +106,100 @@ class ImageRepository:
         db.session.commit()
         return image
 
+    @staticmethod
+    def bulk_create(images):
+        """
+        Add several new images to the database in one flush and commit.
+        SQLAlchemy batches the rows into multi-row INSERT statements and
+        still populates each instance's ID. Committing expires the instances,
+        so they are reloaded together with one SELECT instead of one refresh
+        per instance when they are serialized.
+        
+        Args:
+            images: List of Image model instances to persist
+            
+        Returns:
+            list: The persisted Image instances with populated IDs
+        """
+        db.session.add_all(images)
+        db.session.flush()
+        image_ids = [image.id for image in images]
+        db.session.commit()
+        db.session.execute(db.select(Image).where(Image.id.in_(image_ids))).scalars().all()
+        return images
+
+    @staticmethod
+    def update_analysis(image_id, ai_description, analysis_status):
+        """
+        Record the outcome of an image's background analysis with a single
+        UPDATE, without loading the image first.
+        
+        Args:
+            image_id: Primary key of the analyzed image
+            ai_description: Generated description, or None if analysis failed
+            analysis_status: New Image.ANALYSIS_* status
+            
+        Returns:
+            bool: True if the image still exists and was updated
+        """
+        result = db.session.execute(
+            db.update(Image)
+            .where(Image.id == image_id)
+            .values(ai_description=ai_description, analysis_status=analysis_status)
+        )
+        db.session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def list_stale_pending(started_before, limit=100):
+        """
+        List images whose analysis is still pending but was submitted before
+        a cutoff (or has no submission time), oldest first.
+        
+        Args:
+            started_before: Cutoff datetime for the last analysis submission
+            limit: Maximum number of rows to return
+            
+        Returns:
+            list: Rows (id, s3_key, analysis_started_at)
+        """
+        return db.session.execute(
+            db.select(Image.id, Image.s3_key, Image.analysis_started_at)
+            .where(
+                Image.analysis_status == Image.ANALYSIS_PENDING,
+                or_(Image.analysis_started_at.is_(None), Image.analysis_started_at < started_before)
+            )
+            .order_by(Image.analysis_started_at)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def claim_analysis(image_id, previous_started_at, started_at):
+        """
+        Mark a pending analysis as re-submitted, only if its submission time
+        is still the one that was read (compare-and-set), so that concurrent
+        workers never restart the same analysis twice.
+        
+        Args:
+            image_id: Primary key of the image
+            previous_started_at: analysis_started_at as read by the caller
+            started_at: New submission time
+            
+        Returns:
+            bool: True if this caller claimed the analysis
+        """
+        if previous_started_at is None:
+            unchanged = Image.analysis_started_at.is_(None)
+        else:
+            unchanged = Image.analysis_started_at == previous_started_at
+        result = db.session.execute(
+            db.update(Image)
+            .where(Image.id == image_id, Image.analysis_status == Image.ANALYSIS_PENDING, unchanged)
+            .values(analysis_started_at=started_at)
+        )
+        db.session.commit()
+        return result.rowcount > 0
+
     @staticmethod
     def delete(image):
         """
@@ -86,6 +211,28 @@ class ImageRepository:
         db.session.delete(image)
         db.session.commit()
 
+    @staticmethod
+    def delete_by_id_and_user(image_id, user_id):
+        """
+        Delete an image owned by the specified user in a single statement,
+        without loading it into the session first.
+        
+        Args:
+            image_id: Primary key of the image to delete
+            user_id: User ID to verify ownership
+            
+        Returns:
+            str: S3 key of the deleted image, or None if no matching image exists
+        """
+        result = db.session.execute(
+            db.delete(Image)
+            .where(Image.id == image_id, Image.user_id == user_id)
+            .returning(Image.s3_key)
+        )
+        s3_key = result.scalar_one_or_none()
+        db.session.commit()
+        return s3_key
+
     @staticmethod
     def list_all():
         """
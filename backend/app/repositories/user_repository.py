@@ -1,24 +1,50 @@
 """
 UserRepository: Handles all database operations for the User model.
 """
+from sqlalchemy import bindparam
 from app.models.user import User
+from app.models.image import Image
 from app import db
 
+# Prebuilt statements for hot lookups; SQLAlchemy caches their compiled SQL
+_STMT_USER_BY_USERNAME = db.select(User).where(User.username == bindparam("username"))
+_STMT_USER_BY_EMAIL = db.select(User).where(User.email == bindparam("email"))
+_STMT_PROFILE_BY_ID = (
+    db.select(User.id, User.username, User.email, User.created_at, Image.id.label("image_id"))
+    .outerjoin(Image, Image.user_id == User.id)
+    .where(User.id == bindparam("uid"))
+    .order_by(Image.upload_date.desc(), Image.id.desc())
+)
+
 class UserRepository:
     @staticmethod
     def get_by_id(user_id):
         """Fetch a user by primary key."""
-        return User.query.get(user_id)
+        return db.session.get(User, user_id)
+
+    @staticmethod
+    def get_profile_rows(user_id):
+        """
+        Fetch a user's profile columns and image ids in a single query,
+        without hydrating ORM objects. Returns one row per image, newest
+        first (a single row with image_id None if the user has no images),
+        or an empty list if the user does not exist.
+        """
+        return db.session.execute(_STMT_PROFILE_BY_ID, {"uid": user_id}).all()
 
     @staticmethod
     def get_by_username(username):
         """Fetch a user by username."""
-        return User.query.filter_by(username=username).first()
+        return db.session.execute(
+            _STMT_USER_BY_USERNAME, {"username": username}
+        ).scalar_one_or_none()
 
     @staticmethod
     def get_by_email(email):
         """Fetch a user by email."""
-        return User.query.filter_by(email=email).first()
+        return db.session.execute(
+            _STMT_USER_BY_EMAIL, {"email": email}
+        ).scalar_one_or_none()
 
     @staticmethod
     def create(user):
@@ -27,6 +53,12 @@ class UserRepository:
         db.session.commit()
         return user
 
+    @staticmethod
+    def save(user):
+        """Persist changes to an existing user."""
+        db.session.commit()
+        return user
+
     @staticmethod
     def delete(user):
         """Delete a user from the database."""
@@ -37,3 +69,20 @@ class UserRepository:
     def list_all():
         """List all users."""
         return User.query.all()
+
+    @staticmethod
+    def list_page_projected(after_id=0, limit=100):
+        """
+        List one page of users as lightweight (id, username, email, created_at)
+        rows, using keyset pagination on the primary key.
+        
+        Args:
+            after_id: Only users with a greater id are returned
+            limit: Maximum number of rows to return
+        """
+        return db.session.execute(
+            db.select(User.id, User.username, User.email, User.created_at)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        ).all()
@@ -1,10 +1,37 @@
 # Blueprint for image endpoints (upload, list, etc.)
+import hashlib
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.controllers.image_controller import upload_image, get_image, get_all_images, delete_image
+from app.controllers.image_controller import (
+    upload_image, bulk_upload_images, get_image, get_image_analysis, get_all_images, delete_image
+)
+from app.models.image import Image
 
 image_bp = Blueprint("image", __name__)
 
+# How long clients may reuse a single image response without revalidating
+IMAGE_MAX_AGE = 300
+
+
+def _conditional_json(data, status, max_age=0):
+    """
+    Build a JSON response with an ETag over the serialized body, answering
+    304 Not Modified when the client's If-None-Match already matches.
+    The ETag covers every field (including the rotating presigned URL), so
+    a cached body is never reused after its content changes.
+    """
+    response = jsonify(data)
+    response.status_code = status
+    if status != 200:
+        return response
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+    response.cache_control.private = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @image_bp.route('/upload', methods=['POST'])
 @jwt_required()
 def upload():
@@ -15,19 +42,42 @@ def upload():
     response, status = upload_image(user_id, file_storage, metadata)
     return jsonify(response), status
 
+@image_bp.route('/upload/bulk', methods=['POST'])
+@jwt_required()
+def bulk_upload():
+    user_id = int(get_jwt_identity())
+    # Every part named "files" is one image
+    response, status = bulk_upload_images(user_id, request.files.getlist('files'))
+    return jsonify(response), status
+
 @image_bp.route('/<int:image_id>', methods=['GET'])
 @jwt_required()
 def get_single_image(image_id):
     user_id = int(get_jwt_identity())
     response, status = get_image(user_id, image_id)
-    return jsonify(response), status
+    # A pending image is about to change, so it must not be reused unchecked
+    max_age = IMAGE_MAX_AGE if response.get('analysis_status') != Image.ANALYSIS_PENDING else 0
+    return _conditional_json(response, status, max_age=max_age)
+
+@image_bp.route('/<int:image_id>/analysis', methods=['GET'])
+@jwt_required()
+def get_single_image_analysis(image_id):
+    user_id = int(get_jwt_identity())
+    response, status = get_image_analysis(user_id, image_id)
+    # Polled while analysis runs; an unchanged state costs only a 304
+    return _conditional_json(response, status)
 
 @image_bp.route('/', methods=['GET'])
 @jwt_required()
 def list_images():
     user_id = int(get_jwt_identity())
-    response, status = get_all_images(user_id)
-    return jsonify(response), status
+    # Optional pagination: ?limit=<n>&offset=<n>
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    response, status = get_all_images(user_id, limit=limit, offset=offset)
+    # Lists must always revalidate (deletes don't change any upload date),
+    # but an unchanged list costs only a 304
+    return _conditional_json(response, status)
 
 @image_bp.route('/<int:image_id>', methods=['DELETE'])
 @jwt_required()
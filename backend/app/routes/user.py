@@ -1,8 +1,7 @@
 # Blueprint for user endpoints (profile, update, etc.)
 from flask import Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.user_service import UserService
-from app.schemas.user_schema import UserSchema
+from app.controllers.user_controller import get_user_profile
 from flask import jsonify
 
 user_bp = Blueprint("user", __name__)
@@ -11,16 +10,17 @@ user_bp = Blueprint("user", __name__)
 @jwt_required()
 def get_my_profile():
     user_id = int(get_jwt_identity())
-    user = UserService.get_user_profile(user_id)
-    if not user:
-        return jsonify({"errors": "User not found."}), 404
-    user_data = UserSchema().dump(user)
-    return jsonify(user_data), 200
+    response, status = get_user_profile(user_id)
+    return jsonify(response), status
 
 """ @user_bp.route('/', methods=['GET'])
 @jwt_required()
-def list_users():
+def list_all_users():
     # Optionally restrict to admin users only
-    users = UserService.list_users()
-    user_data = UserSchema(many=True).dump(users)
-    return jsonify(user_data), 200 """
+    # Keyset pagination: ?after=<last id of the previous page>&limit=<n>
+    # Needs: from flask import request; from app.controllers.user_controller import list_users
+    response, status = list_users(
+        after_id=request.args.get('after', default=0, type=int),
+        limit=request.args.get('limit', default=100, type=int)
+    )
+    return jsonify(response), status """
@@ -2,21 +2,26 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from marshmallow import fields
 from app.models.image import Image
-from app.utils.s3_helper import S3Helper
+from app.utils.s3_helper import get_s3_helper
+
+# Presigned URLs are valid for 1 hour; S3Helper reuses a signed URL during
+# the first half of that window so clients always get at least 30 minutes
+PRESIGNED_URL_EXPIRES = 3600
+
+
+def get_presigned_url(s3_key):
+    """Return a (possibly cached) presigned GET URL for an S3 key."""
+    return get_s3_helper().get_presigned_url(s3_key, expires=PRESIGNED_URL_EXPIRES)
+
 
 class ImageSchema(SQLAlchemyAutoSchema):
     s3_url = fields.Method("get_presigned_url")
 
     class Meta:
         model = Image
-        load_instance = True
+        load_instance = False  # Output-only schema; never builds model instances
         include_fk = True
+        exclude = ("analysis_started_at",)  # Internal bookkeeping for stale-analysis recovery
 
     def get_presigned_url(self, obj):
-        s3_helper = S3Helper()
-        # 1 hour expiration
-        return s3_helper.s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': s3_helper.bucket, 'Key': obj.s3_key},
-            ExpiresIn=3600
-        )
+        return get_presigned_url(obj.s3_key)
@@ -2,6 +2,8 @@
 from marshmallow import Schema, fields, validates, ValidationError, validate
 import re
 
+_USERNAME_RE = re.compile(r"^[a-zA-Z0-9_]+$")
+
 class UserLoginSchema(Schema):
     username_or_email = fields.Str(required=True)
     password = fields.Str(required=True)
@@ -16,5 +18,5 @@ class UserLoginSchema(Schema):
             # Validate as username (same rules as registration)
             if not (3 <= len(value) <= 30):
                 raise ValidationError("Username must be between 3 and 30 characters.")
-            if not re.match("^[a-zA-Z0-9_]+$", value):
+            if not _USERNAME_RE.match(value):
                 raise ValidationError("Username must be alphanumeric with underscores only.")
@@ -2,6 +2,10 @@
 from marshmallow import Schema, fields, validates, ValidationError
 import re
 
+_USERNAME_RE = re.compile(r"^[a-zA-Z0-9_]+$")
+_PASSWORD_LETTER_RE = re.compile(r"[A-Za-z]")
+_PASSWORD_DIGIT_RE = re.compile(r"[0-9]")
+
 class UserRegistrationSchema(Schema):
     username = fields.Str(required=True, validate=lambda s: 3 <= len(s) <= 30)
     email = fields.Email(required=True)
@@ -9,10 +13,10 @@ class UserRegistrationSchema(Schema):
 
     @validates("username")
     def validate_username(self, value, **kwargs):
-        if not re.match("^[a-zA-Z0-9_]+$", value):
+        if not _USERNAME_RE.match(value):
             raise ValidationError("Username must be alphanumeric with underscores only.")
 
     @validates("password")
     def validate_password(self, value, **kwargs):
-        if not re.search(r"[A-Za-z]", value) or not re.search(r"[0-9]", value):
+        if not _PASSWORD_LETTER_RE.search(value) or not _PASSWORD_DIGIT_RE.search(value):
             raise ValidationError("Password must contain at least one letter and one number.")
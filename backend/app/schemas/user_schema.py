@@ -5,6 +5,20 @@ from app.models.user import User
 class UserSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = User
-        load_instance = True
+        load_instance = False  # Output-only schema; never builds model instances
         include_relationships = True
         exclude = ("password_hash",)  # Never expose password hashes
+
+
+def dump_user_profile(profile):
+    """
+    Serialize a UserProfile; matches UserSchema's output for a User
+    (password hash excluded, images as a list of ids).
+    """
+    return {
+        "id": profile.id,
+        "username": profile.username,
+        "email": profile.email,
+        "created_at": profile.created_at.isoformat() if profile.created_at else None,
+        "images": list(profile.images),
+    }
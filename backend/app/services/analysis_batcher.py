@@ -0,0 +1,101 @@
+"""
+Analysis Batcher: Coalesces concurrent single-image analysis requests into batched
+workflow calls.
+
+Request threads submit one image each and block on a Future; a background worker
+drains the queue into batches of up to `max_batch_size` images, waiting at most
+`batch_timeout_ms` for a batch to fill, then sends the whole batch in one provider
+call and hands each result back to its Future. Under load this amortizes the
+per-call RPC, TLS and serialization overhead over many uploads; when idle, a lone
+request only waits for the batch timeout.
+"""
+import time
+import logging
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisBatcher:
+    """
+    Background micro-batcher around a batch prediction function.
+    The worker thread is started on first submit, so with `gunicorn --preload`
+    each forked worker process gets its own thread.
+    """
+
+    def __init__(self, app, predict_batch, max_batch_size=16, batch_timeout_ms=30):
+        """
+        Args:
+            app: Flask app; each batch runs inside its app context
+            predict_batch: Callable taking a list of (image_bytes, image_url) tuples
+                           and returning one result dict per input, in order
+            max_batch_size: Maximum number of images per provider call
+            batch_timeout_ms: Maximum time to wait for a batch to fill
+        """
+        self.app = app
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+        self._queue = Queue()
+        self._worker = None
+        self._start_lock = Lock()
+
+    def submit(self, image_bytes=None, image_url=None):
+        """
+        Queue one image for analysis.
+
+        Args:
+            image_bytes: Binary image data (takes precedence if both provided)
+            image_url: URL to the image
+
+        Returns:
+            Future: Resolves to the analysis result dict
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put(((image_bytes, image_url), future))
+        return future
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._start_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = Thread(target=self._run, name="analysis-batcher", daemon=True)
+                    self._worker.start()
+
+    def _next_batch(self):
+        """Block for the first item, then collect more until full or timed out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_timeout
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            # Skip requests whose callers already gave up
+            batch = [(inputs, future) for inputs, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            logger.debug("Dispatching analysis batch of %s images", len(batch))
+            try:
+                with self.app.app_context():
+                    results = self.predict_batch([inputs for inputs, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Expected {len(batch)} results, got {len(results)}")
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.exception("Analysis batch failed: %s", e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
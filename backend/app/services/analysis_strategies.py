@@ -1,162 +1,225 @@
 """
 Analysis Strategies: Implements the Strategy design pattern for image analysis.
-This module defines several concrete strategies for analyzing images using different approaches:
+Each strategy is a plain function taking the analysis service and the image inputs;
+STRATEGIES maps strategy names to them for runtime selection:
 1. URL-based analysis: Uses pre-signed URLs to analyze images directly from storage
 2. Bytes-based analysis: Uses binary image data for analysis
-3. Fallback analysis: Attempts URL-based strategy first, then falls back to bytes-based if needed
+3. Fallback analysis: Runs URL- and bytes-based analysis concurrently and keeps the first good result
 
 This pattern allows for flexible image analysis approaches while encapsulating the complexity
 of each strategy's implementation details.
 """
-from abc import ABC, abstractmethod
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Lock
+from types import MappingProxyType
+from cachetools import TTLCache
 from flask import current_app
 
+# Child of the Flask app logger ("app"), so records go through its handlers
+logger = logging.getLogger(__name__)
 
-class AnalysisStrategy(ABC):
-    """
-    Abstract base class for image analysis strategies.
-    Defines the interface that all concrete analysis strategies must implement.
-    Follows the Strategy design pattern to enable runtime selection of analysis algorithms.
-    """
-    
-    @abstractmethod
-    def analyze(self, analysis_service, image_bytes=None, image_url=None, **kwargs):
-        """
-        Abstract method to analyze an image using a specific strategy.
-        Must be implemented by all concrete strategy classes.
-        
-        Args:
-            analysis_service: The AI service instance to use for analysis
-            image_bytes: Binary image data (optional)
-            image_url: URL to the image (optional)
-            **kwargs: Additional strategy-specific parameters
-            
-        Returns:
-            dict: Analysis result with structured data
-        """
-        pass
-
-
-class UrlAnalysisStrategy(AnalysisStrategy):
+# Static error results, built once; read-only since they are shared by every call
+_NO_URL = MappingProxyType({"using_fallback": True, "error": "No URL provided"})
+_NO_BYTES = MappingProxyType({"using_fallback": True, "error": "No image data provided"})
+_NO_INPUT = MappingProxyType({"using_fallback": True, "error": "Neither URL nor bytes provided"})
+
+# Shared pool for the speculative URL/bytes requests of analyze_fallback
+_FALLBACK_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis")
+
+
+# URLs whose analysis failed recently, mapped to the error. The fallback strategy
+# goes straight to bytes for these instead of waiting on another timeout.
+FAILED_URL_TTL = 60
+_failed_urls = TTLCache(maxsize=1024, ttl=FAILED_URL_TTL)
+_failed_urls_lock = Lock()
+
+
+def _recent_url_failure(image_url):
+    """Return the cached error for a recently failed URL, or None."""
+    with _failed_urls_lock:
+        return _failed_urls.get(image_url)
+
+
+def _record_url_failure(image_url, error):
+    """Remember that analysis of a URL failed, for FAILED_URL_TTL seconds."""
+    with _failed_urls_lock:
+        _failed_urls[image_url] = error
+
+
+def _analyze_in_app_context(app, analysis_service, **kwargs):
+    """Run analyze_image on a pool thread, inside the caller's app context."""
+    with app.app_context():
+        return analysis_service.analyze_image(**kwargs)
+
+
+def _is_good_result(result):
+    """True if an analysis result has a description and is not a fallback."""
+    return bool(result.get('description')) and not result.get('using_fallback', False)
+
+
+def analyze_url(analysis_service, image_bytes=None, image_url=None, **kwargs):
     """
-    Concrete strategy that analyzes images via URL.
+    Analyze an image using only its URL.
     This is typically more efficient as it doesn't require transferring image data twice,
     but depends on the AI service having network access to the image URL.
-    """
     
-    def analyze(self, analysis_service, image_bytes=None, image_url=None, **kwargs):
-        """
-        Analyze an image using only its URL.
+    Args:
+        analysis_service: The AI service to use for analysis
+        image_bytes: Binary image data (ignored in this strategy)
+        image_url: URL to the image (required)
+        **kwargs: Additional parameters
         
-        Args:
-            analysis_service: The AI service to use for analysis
-            image_bytes: Binary image data (ignored in this strategy)
-            image_url: URL to the image (required)
-            **kwargs: Additional parameters
-            
-        Returns:
-            dict: Analysis results or error response if URL is missing
-        """
-        if not image_url:
-            current_app.logger.warning("URL strategy selected but no URL provided")
-            return {"using_fallback": True, "error": "No URL provided"}
-            
-        current_app.logger.info(f"Analyzing image via URL: {image_url}")
-        return analysis_service.analyze_image(image_url=image_url)
-
-
-class BytesAnalysisStrategy(AnalysisStrategy):
+    Returns:
+        dict: Analysis results or error response if URL is missing
     """
-    Concrete strategy that analyzes images via binary data.
+    if not image_url:
+        logger.warning("URL strategy selected but no URL provided")
+        return _NO_URL
+        
+    logger.info("Analyzing image via URL: %s", image_url)
+    return analysis_service.analyze_image(image_url=image_url)
+
+
+def analyze_bytes(analysis_service, image_bytes=None, image_url=None, **kwargs):
+    """
+    Analyze an image using its binary data.
     This approach is more reliable as it doesn't depend on network accessibility
     of the image URL, but requires transferring the image data twice.
-    """
     
-    def analyze(self, analysis_service, image_bytes=None, image_url=None, **kwargs):
-        """
-        Analyze an image using its binary data.
+    Args:
+        analysis_service: The AI service to use for analysis
+        image_bytes: Binary image data (required)
+        image_url: URL to the image (ignored in this strategy)
+        **kwargs: Additional parameters
         
-        Args:
-            analysis_service: The AI service to use for analysis
-            image_bytes: Binary image data (required)
-            image_url: URL to the image (ignored in this strategy)
-            **kwargs: Additional parameters
-            
-        Returns:
-            dict: Analysis results or error response if bytes are missing
-        """
-        if not image_bytes:
-            current_app.logger.warning("Bytes strategy selected but no bytes provided")
-            return {"using_fallback": True, "error": "No image data provided"}
-            
-        current_app.logger.info("Analyzing image via bytes")
-        return analysis_service.analyze_image(image_bytes=image_bytes)
+    Returns:
+        dict: Analysis results or error response if bytes are missing
+    """
+    if not image_bytes:
+        logger.warning("Bytes strategy selected but no bytes provided")
+        return _NO_BYTES
+        
+    logger.info("Analyzing image via bytes")
+    return analysis_service.analyze_image(image_bytes=image_bytes)
 
 
-class FallbackAnalysisStrategy(AnalysisStrategy):
+def analyze_fallback(analysis_service, image_bytes=None, image_url=None, **kwargs):
     """
     Advanced strategy that combines URL and bytes approaches for maximum reliability.
-    First attempts to analyze using URL (more efficient), then falls back to bytes
-    if URL analysis fails or returns empty results. This provides the best balance
-    between efficiency and reliability.
+    When both inputs are available, the URL and bytes analyses are dispatched
+    concurrently and the first good result wins, so a failing URL analysis
+    no longer adds a full extra round-trip before the bytes attempt starts.
+
+    Args:
+        analysis_service: The AI service to use for analysis
+        image_bytes: Binary image data
+        image_url: URL to the image
+        **kwargs: Additional parameters
+
+    Returns:
+        dict: Analysis results from either URL or bytes analysis
     """
+    url_error = _recent_url_failure(image_url) if image_url else None
+    if url_error is not None:
+        logger.warning("Skipping URL analysis, it failed recently: %s", url_error)
+        if not image_bytes:
+            return {"using_fallback": True, "error": f"URL analysis failed recently and no bytes provided: {url_error}"}
+        image_url = None
     
-    def analyze(self, analysis_service, image_bytes=None, image_url=None, **kwargs):
-        """
-        Analyze an image using the fallback approach (URL first, then bytes).
-        Implements a comprehensive error handling and fallback mechanism.
-        
-        Args:
-            analysis_service: The AI service to use for analysis
-            image_bytes: Binary image data (used as fallback)
-            image_url: URL to the image (tried first if available)
-            **kwargs: Additional parameters
-            
-        Returns:
-            dict: Analysis results from either URL or bytes analysis
-        """
-        if image_url:
+    if image_url and image_bytes:
+        return _analyze_speculatively(analysis_service, image_bytes, image_url)
+    elif image_url:
+        try:
+            logger.info("Attempting URL-based analysis: %s", image_url)
+            result = analysis_service.analyze_image(image_url=image_url)
+            if result.get('using_fallback', False):
+                _record_url_failure(image_url, result.get('error'))
+            if not _is_good_result(result):
+                logger.error("No image bytes available for fallback")
+            return result
+        except Exception as e:
+            _record_url_failure(image_url, str(e))
+            return {"using_fallback": True, "error": f"URL analysis failed and no bytes provided: {str(e)}"}
+    elif image_bytes:
+        # No URL available, use bytes directly
+        logger.info("No URL provided, using bytes directly")
+        return analysis_service.analyze_image(image_bytes=image_bytes)
+    else:
+        # Neither input method available - invalid request
+        return _NO_INPUT
+
+def _analyze_speculatively(analysis_service, image_bytes, image_url):
+    """
+    Dispatch URL and bytes analyses in parallel and return the first good
+    result; if neither succeeds, return the bytes result (or a combined error).
+
+    Args:
+        analysis_service: The AI service to use for analysis
+        image_bytes: Binary image data
+        image_url: URL to the image
+
+    Returns:
+        dict: Analysis results
+    """
+    app = current_app._get_current_object()
+    logger.info("Running URL and bytes analysis concurrently: %s", image_url)
+    url_future = _FALLBACK_POOL.submit(
+        _analyze_in_app_context, app, analysis_service, image_url=image_url
+    )
+    bytes_future = _FALLBACK_POOL.submit(
+        _analyze_in_app_context, app, analysis_service, image_bytes=image_bytes
+    )
+
+    results, errors = {}, {}
+    pending = {url_future, bytes_future}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            kind = "url" if future is url_future else "bytes"
             try:
-                # First attempt: URL-based analysis
-                current_app.logger.info(f"Attempting URL-based analysis: {image_url}")
-                result = analysis_service.analyze_image(image_url=image_url)
-                
-                # Check for failure indicators in the result
-                # If the result indicates a fallback was used or no description was found,
-                # try bytes instead for more reliable results
-                if result.get('using_fallback', False) or not result.get('description'):
-                    current_app.logger.warning(
-                        f"URL analysis failed or returned no results: {result.get('error')}, trying bytes"
-                    )
-                    # Only attempt bytes analysis if we have the image data
-                    if image_bytes:
-                        return analysis_service.analyze_image(image_bytes=image_bytes)
-                    else:
-                        current_app.logger.error("No image bytes available for fallback")
-                
-                # URL analysis succeeded
-                return result
-                
+                results[kind] = future.result()
             except Exception as e:
-                # Error handling for URL analysis failure
-                current_app.logger.warning(f"URL analysis failed with error: {str(e)}, trying bytes")
-                # Fallback to bytes analysis if available
-                if image_bytes:
-                    try:
-                        return analysis_service.analyze_image(image_bytes=image_bytes)
-                    except Exception as bytes_error:
-                        # Both methods failed - comprehensive error reporting
-                        current_app.logger.error(f"Bytes analysis also failed: {str(bytes_error)}")
-                        return {
-                            "using_fallback": True, 
-                            "error": f"Both URL and bytes analysis failed: {str(e)} / {str(bytes_error)}"
-                        }
-                else:
-                    return {"using_fallback": True, "error": f"URL analysis failed and no bytes provided: {str(e)}"}
-        elif image_bytes:
-            # No URL available, use bytes directly
-            current_app.logger.info("No URL provided, using bytes directly")
-            return analysis_service.analyze_image(image_bytes=image_bytes)
-        else:
-            # Neither input method available - invalid request
-            return {"using_fallback": True, "error": "Neither URL nor bytes provided"}
\ No newline at end of file
+                logger.warning("%s analysis failed with error: %s", kind, e)
+                errors[kind] = e
+                if kind == "url":
+                    _record_url_failure(image_url, str(e))
+                continue
+            if kind == "url" and results[kind].get('using_fallback', False):
+                _record_url_failure(image_url, results[kind].get('error'))
+            if _is_good_result(results[kind]):
+                # The other request is left to finish in the background;
+                # a successful result still lands in the analysis cache
+                for other in pending:
+                    other.cancel()
+                return results[kind]
+
+    # Neither analysis produced a description
+    if "bytes" in results:
+        return results["bytes"]
+    if "url" in results:
+        return results["url"]
+    logger.error("Both URL and bytes analysis failed: %s", errors)
+    return {
+        "using_fallback": True,
+        "error": f"Both URL and bytes analysis failed: {str(errors.get('url'))} / {str(errors.get('bytes'))}"
+    }
+
+
+# Strategy functions by name, for selection from configuration
+STRATEGIES = {
+    "url": analyze_url,
+    "bytes": analyze_bytes,
+    "fallback": analyze_fallback,
+}
+
+# Strategies that can only work from a URL, even when the bytes are at hand
+_URL_ONLY_STRATEGIES = frozenset({analyze_url})
+
+
+def needs_url(strategy):
+    """
+    True if a strategy needs an image URL, so callers holding the bytes
+    still have to create one (e.g. a presigned storage URL) for it.
+    """
+    return strategy in _URL_ONLY_STRATEGIES
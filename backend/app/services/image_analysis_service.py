@@ -5,19 +5,133 @@ Currently implements Clarifai workflow-based image analysis with fallback mechan
 The design supports extending to other AI providers in the future.
 """
 import sys
-import traceback
+import uuid
+import logging
+import importlib
+import heapq
+import io
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from threading import Lock
+from types import SimpleNamespace
+from cachetools import TTLCache
 from flask import current_app
+from app.services.analysis_batcher import AnalysisBatcher
 
-# Conditional import with error handling to prevent application crashes
-# when optional dependencies are not installed
+# Optional perceptual hashing for near-duplicate memoization
 try:
-    # Clarifai client imports - version 11.2+ uses this API structure
-    from clarifai.client.user import User
-    from clarifai.client.workflow import Workflow
-    CLARIFAI_AVAILABLE = True
-except ImportError as e:
-    current_app.logger.error(f"Clarifai import error: {str(e)}, paths: {sys.path}")
-    CLARIFAI_AVAILABLE = False
+    import imagehash
+    from PIL import Image as PILImage
+    IMAGEHASH_AVAILABLE = True
+except ImportError:
+    IMAGEHASH_AVAILABLE = False
+
+# Child of the Flask app logger ("app"), so records go through its handlers
+logger = logging.getLogger(__name__)
+
+# Memoized results of successful analyses, keyed by workflow and image identity
+# (a content digest for bytes, the URL itself for URLs). Repeat analyses of the
+# same image - retries, fallback re-runs, re-uploads - skip the remote call.
+# Entries expire so workflow model updates eventually show up for cached images.
+ANALYSIS_CACHE_SIZE = 1024
+ANALYSIS_CACHE_TTL = 24 * 60 * 60
+_analysis_cache = TTLCache(maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL)
+_analysis_cache_lock = Lock()
+
+# Near-duplicate memoization: successful bytes analyses are also indexed by a
+# 64-bit perceptual hash (dHash), and an image within FUZZY_MATCH_DISTANCE bits
+# of a cached one (a resized or recompressed copy) reuses its result. The scan
+# is linear, which at this size costs well under a millisecond.
+FUZZY_MATCH_DISTANCE = 4
+_fuzzy_cache = TTLCache(maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL)
+
+# A recognised concept: label, confidence score and the id of the model that produced it
+Concept = namedtuple("Concept", "name value model")
+# C-level sort key for Concept.value (tuple index 1)
+_concept_value = itemgetter(1)
+
+# Only the highest-confidence concepts above the threshold are kept per analysis
+MAX_CONCEPTS = 50
+CONCEPT_THRESHOLD = 0.5
+
+# Applied server-side to every model in the workflow, so low-confidence and
+# surplus concepts are neither sent over the wire nor decoded; the local
+# threshold/top-N filtering still runs since the cut-off is inclusive here
+WORKFLOW_OUTPUT_CONFIG = {"min_value": CONCEPT_THRESHOLD, "max_concepts": MAX_CONCEPTS}
+
+# Description sentences by number of concept names (1, 2, 3 or more)
+_DESCRIPTION_TEMPLATES = (
+    lambda names: f"This image appears to be a {names[0]}.",
+    lambda names: f"This image appears to contain {names[0]} and {names[1]}.",
+    lambda names: "This image appears to contain " + ", ".join(names[:-1]) + f", and {names[-1]}.",
+)
+
+# Clarifai accepts at most this many inputs in a single workflow predict call
+MAX_BATCH_SIZE = 32
+
+# Clarifai status code of a successful prediction (status_code_pb2.SUCCESS)
+STATUS_SUCCESS = 10000
+
+# How long a request waits for its image's batched analysis before giving up
+BATCH_RESULT_TIMEOUT = 60
+
+# One micro-batcher per workflow, shared by all service instances
+_batchers = {}
+_batchers_lock = Lock()
+
+
+def clear_cache():
+    """Drop all memoized analysis results (mainly for tests)."""
+    with _analysis_cache_lock:
+        _analysis_cache.clear()
+        _fuzzy_cache.clear()
+
+
+def _perceptual_hash(image_bytes):
+    """
+    Compute a 64-bit dHash of an image, or None if it can't be decoded.
+    JPEG decoding is reduced to a small grayscale draft first, since dHash
+    only looks at a 9x8 thumbnail.
+    """
+    try:
+        image = PILImage.open(io.BytesIO(image_bytes))
+        image.draft("L", (64, 64))
+        return int(str(imagehash.dhash(image, hash_size=8)), 16)
+    except Exception as e:
+        logger.debug("Perceptual hash failed: %s", e)
+        return None
+
+
+@lru_cache(maxsize=8)
+def _get_workflow(workflow_cls, workflow_url, pat):
+    """
+    Return a shared Workflow client for the given URL and token.
+    Building one parses the URL and sets up auth and the gRPC channel, so it
+    is done once per process; the client is safe to share across threads.
+    """
+    return workflow_cls(url=workflow_url, pat=pat, output_config=WORKFLOW_OUTPUT_CONFIG)
+
+
+def _get_batcher(service):
+    """
+    Return the shared micro-batcher for a service's workflow, creating it on
+    first use. Services for the same workflow and token are interchangeable,
+    so the first one's batch method serves them all.
+    """
+    key = (service.workflow_url, service.pat)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = AnalysisBatcher(
+                current_app._get_current_object(),
+                service._analyze_batch_with_clarifai_workflow,
+                max_batch_size=min(current_app.config.get('CLARIFAI_BATCH_SIZE', 16), MAX_BATCH_SIZE),
+                batch_timeout_ms=current_app.config.get('CLARIFAI_BATCH_TIMEOUT_MS', 30)
+            )
+            _batchers[key] = batcher
+        return batcher
 
 
 class ImageAnalysisService:
@@ -27,6 +141,38 @@ class ImageAnalysisService:
     and graceful degradation when services are unavailable.
     """
     
+    # Clarifai SDK classes, imported on first use: None until loaded, False if
+    # the package is not installed
+    _sdk = None
+    _sdk_lock = Lock()
+    
+    @classmethod
+    def _load_clarifai(cls):
+        """
+        Import the optional Clarifai SDK once per process and cache its classes
+        on the class. Deferring the import keeps its gRPC/protobuf module
+        loading out of app start-up and out of workers that never analyze.
+        
+        Returns:
+            SimpleNamespace: User, Workflow, Inputs and MessageToDict, or None
+                             if the package is not installed
+        """
+        if cls._sdk is None:
+            with cls._sdk_lock:
+                if cls._sdk is None:
+                    try:
+                        # Clarifai client imports - version 11.2+ uses this API structure
+                        cls._sdk = SimpleNamespace(
+                            User=importlib.import_module("clarifai.client.user").User,
+                            Workflow=importlib.import_module("clarifai.client.workflow").Workflow,
+                            Inputs=importlib.import_module("clarifai.client.input").Inputs,
+                            MessageToDict=importlib.import_module("google.protobuf.json_format").MessageToDict
+                        )
+                    except ImportError as e:
+                        logger.error("Clarifai import error: %s, paths: %s", e, sys.path)
+                        cls._sdk = False
+        return cls._sdk or None
+    
     def __init__(self, provider="clarifai"):
         """
         Initialize the image analysis service with the specified provider.
@@ -40,39 +186,45 @@ class ImageAnalysisService:
         self.is_available = False
         self.workflow_url = None
         self.user = None
+        self._workflow = None
+        self._batcher = None
         
         # Provider-specific initialization with comprehensive error handling
         try:
             if provider == "clarifai":
                 # Check if Clarifai package is available
-                if not CLARIFAI_AVAILABLE:
-                    current_app.logger.warning("Clarifai package is not installed. Image analysis will be disabled.")
+                sdk = self._load_clarifai()
+                if sdk is None:
+                    logger.warning("Clarifai package is not installed. Image analysis will be disabled.")
                     return
                 
                 # Get authentication credentials from configuration
                 self.pat = current_app.config.get('CLARIFAI_PAT')
                 if not self.pat:
-                    current_app.logger.warning("CLARIFAI_PAT is not set in the application configuration. Image analysis will be disabled.")
+                    logger.warning("CLARIFAI_PAT is not set in the application configuration. Image analysis will be disabled.")
                     return
                 
                 # Get the workflow URL from configuration
                 self.workflow_url = current_app.config.get('CLARIFAI_WORKFLOW_URL')
                 if not self.workflow_url:
-                    current_app.logger.warning("CLARIFAI_WORKFLOW_URL not set. Image analysis will be disabled.")
+                    logger.warning("CLARIFAI_WORKFLOW_URL not set. Image analysis will be disabled.")
                     return
                 
                 try:
                     # Initialize Clarifai user with the PAT for authentication
-                    self.user = User(pat=self.pat)
+                    self.user = sdk.User(pat=self.pat)
+                    self._workflow = _get_workflow(sdk.Workflow, self.workflow_url, self.pat)
+                    if current_app.config.get('CLARIFAI_BATCH_SIZE', 16) > 1:
+                        self._batcher = _get_batcher(self)
                     self.is_available = True
-                    current_app.logger.info(f"Clarifai image analysis service initialized successfully with workflow URL: {self.workflow_url}")
+                    logger.info("Clarifai image analysis service initialized successfully with workflow URL: %s", self.workflow_url)
                 except Exception as init_error:
-                    current_app.logger.error(f"Clarifai client initialization error: {str(init_error)}")
+                    logger.error("Clarifai client initialization error: %s", init_error)
                     return
             else:
-                current_app.logger.warning(f"Unsupported provider: {provider}. Image analysis will be disabled.")
+                logger.warning("Unsupported provider: %s. Image analysis will be disabled.", provider)
         except Exception as e:
-            current_app.logger.error(f"Failed to initialize image analysis service: {str(e)}")
+            logger.error("Failed to initialize image analysis service: %s", e)
         
     def analyze_image(self, image_bytes=None, image_url=None):
         """
@@ -98,21 +250,222 @@ class ImageAnalysisService:
         if not image_bytes and not image_url:
             return self._create_fallback_response("Either image_bytes or image_url must be provided")
             
+        # Serve repeat analyses of the same image from the memo cache
+        cache_key = self._cache_key(image_bytes, image_url)
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached analysis result")
+            return dict(cached)
+        
+        # Then look for a near-duplicate of an image analyzed before
+        fuzzy_key = None
+        if image_bytes and IMAGEHASH_AVAILABLE:
+            phash = _perceptual_hash(image_bytes)
+            if phash is not None:
+                fuzzy_key = (self.provider, self.workflow_url, phash)
+                cached = self._find_near_duplicate(fuzzy_key)
+                if cached is not None:
+                    logger.info("Using cached analysis of a near-duplicate image")
+                    return dict(cached, fuzzy_memo=True)
+            
         # Provider-specific analysis with error handling
         try:
             if self.provider == "clarifai":
-                return self._analyze_with_clarifai_workflow(image_bytes, image_url)
+                result = self._analyze_with_clarifai_workflow(image_bytes, image_url)
             else:
                 return self._create_fallback_response(f"Unsupported provider: {self.provider}")
         except Exception as e:
-            current_app.logger.error(f"Image analysis error: {str(e)}")
+            logger.error("Image analysis error: %s", e)
             return self._create_fallback_response(f"Analysis failed: {str(e)}")
+        
+        # Only successful analyses are memoized, without any debug raw response
+        if not result.get('using_fallback', False):
+            memo = {
+                "description": result.get("description"),
+                "concepts": result.get("concepts", []),
+                "workflow_url": result.get("workflow_url")
+            }
+            with _analysis_cache_lock:
+                _analysis_cache[cache_key] = memo
+                if fuzzy_key is not None:
+                    _fuzzy_cache[fuzzy_key] = memo
+        return result
+    
+    def _find_near_duplicate(self, fuzzy_key):
+        """
+        Find a memoized analysis of a visually similar image.
+        
+        Args:
+            fuzzy_key: (provider, workflow URL, perceptual hash) of the new image
+            
+        Returns:
+            dict: The closest cached result within FUZZY_MATCH_DISTANCE, or None
+        """
+        provider, workflow_url, phash = fuzzy_key
+        best, best_distance = None, FUZZY_MATCH_DISTANCE + 1
+        with _analysis_cache_lock:
+            for (cached_provider, cached_workflow, cached_hash), memo in _fuzzy_cache.items():
+                if cached_provider != provider or cached_workflow != workflow_url:
+                    continue
+                distance = (phash ^ cached_hash).bit_count()
+                if distance < best_distance:
+                    best, best_distance = memo, distance
+        return best
+    
+    def _cache_key(self, image_bytes=None, image_url=None):
+        """
+        Build the memo cache key for an analysis request.
+        Bytes take precedence over the URL, mirroring analyze_image.
+        
+        Args:
+            image_bytes: Binary image data (if provided)
+            image_url: URL to the image (used if image_bytes not provided)
+            
+        Returns:
+            tuple: (provider, workflow URL, input kind, 16-byte digest or URL)
+        """
+        if image_bytes:
+            digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+            return (self.provider, self.workflow_url, "bytes", digest)
+        return (self.provider, self.workflow_url, "url", image_url)
+    
+    def analyze_images(self, inputs):
+        """
+        Analyze several images, sending uncached ones to the provider in
+        batched calls (up to MAX_BATCH_SIZE images per request) instead of
+        one round-trip per image.
+        
+        Args:
+            inputs: List of (image_bytes, image_url) tuples; as with
+                    analyze_image, bytes take precedence when both are set
+            
+        Returns:
+            list: One result dict per input, in input order, shaped like
+                  analyze_image's return value
+        """
+        results = [None] * len(inputs)
+        pending = []  # (position, image_bytes, image_url, cache_key)
+        
+        for i, (image_bytes, image_url) in enumerate(inputs):
+            if not self.is_available:
+                results[i] = self._create_fallback_response("Image analysis service is not available")
+            elif not image_bytes and not image_url:
+                results[i] = self._create_fallback_response("Either image_bytes or image_url must be provided")
+            elif self.provider != "clarifai":
+                results[i] = self._create_fallback_response(f"Unsupported provider: {self.provider}")
+            else:
+                cache_key = self._cache_key(image_bytes, image_url)
+                with _analysis_cache_lock:
+                    cached = _analysis_cache.get(cache_key)
+                if cached is not None:
+                    results[i] = dict(cached)
+                else:
+                    pending.append((i, image_bytes, image_url, cache_key))
+        
+        # Send the remaining images to the workflow in provider-sized chunks
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start:start + MAX_BATCH_SIZE]
+            chunk_results = self._analyze_batch_with_clarifai_workflow(
+                [(image_bytes, image_url) for _, image_bytes, image_url, _ in chunk]
+            )
+            for (i, _, _, cache_key), result in zip(chunk, chunk_results):
+                results[i] = result
+                if not result.get('using_fallback', False):
+                    with _analysis_cache_lock:
+                        _analysis_cache[cache_key] = {
+                            "description": result.get("description"),
+                            "concepts": result.get("concepts", []),
+                            "workflow_url": result.get("workflow_url")
+                        }
+        return results
+    
+    def _analyze_batch_with_clarifai_workflow(self, inputs):
+        """
+        Internal method to analyze several images with one workflow predict call.
+        
+        Args:
+            inputs: List of (image_bytes, image_url) tuples (at most MAX_BATCH_SIZE)
+            
+        Returns:
+            list: One result dict per input, in input order
+        """
+        try:
+            workflow = self._workflow
+            clarifai_inputs = [
+                self._sdk.Inputs.get_input_from_bytes(uuid.uuid4().hex, image_bytes=image_bytes)
+                if image_bytes else
+                self._sdk.Inputs.get_input_from_url(uuid.uuid4().hex, image_url=image_url)
+                for image_bytes, image_url in inputs
+            ]
+            logger.info("Predicting batch of %s images", len(clarifai_inputs))
+            response = workflow.predict(inputs=clarifai_inputs)
+            
+            # Results come back in input order
+            results = list(response.results)
+            logger.debug("Workflow response status %s with %s results", response.status.code, len(results))
+            if len(results) != len(inputs):
+                raise RuntimeError(f"Expected {len(inputs)} results, got {len(results)}")
+        except Exception as e:
+            if len(inputs) == 1:
+                logger.exception("Clarifai batch workflow API error: %s", e)
+                return [self._create_fallback_response(f"Clarifai workflow error: {str(e)}")]
+            # The workflow rejects the whole batch when any input fails (e.g.
+            # MIXED_STATUS), so retry each image on its own; only the bad ones
+            # then end up with a fallback response
+            logger.warning("Clarifai batch workflow API error, retrying %s images one by one: %s", len(inputs), e)
+            results = None
+        if results is None:
+            return [self._predict_with_clarifai_workflow(image_bytes, image_url) for image_bytes, image_url in inputs]
+        
+        analyses = []
+        for result in results:
+            # Each input carries its own status, independent of its batch
+            if result.status.code != STATUS_SUCCESS:
+                logger.error("Clarifai workflow failed for one input: %s", result.status.description)
+                analyses.append(self._create_fallback_response(
+                    f"Clarifai workflow error: {result.status.description}"
+                ))
+                continue
+            description, concepts = self._parse_workflow_result(result)
+            analysis = {
+                "description": description,
+                "concepts": concepts,
+                "workflow_url": self.workflow_url
+            }
+            if current_app.config.get('DEBUG_CLARIFAI'):
+                analysis["raw_response"] = self._sdk.MessageToDict(result)
+            analyses.append(analysis)
+        return analyses
     
     def _analyze_with_clarifai_workflow(self, image_bytes=None, image_url=None):
         """
         Internal method to analyze an image using Clarifai's workflow API.
         Workflow allows chaining multiple AI models for comprehensive analysis.
         
+        Args:
+            image_bytes: Binary image data (if provided)
+            image_url: URL to the image (used if image_bytes not provided)
+            
+        Returns:
+            dict: Structured response with description, concepts, and metadata
+        """
+        # Coalesce with concurrent requests into one workflow call when batching is on
+        if self._batcher is not None:
+            future = self._batcher.submit(image_bytes, image_url)
+            try:
+                return future.result(timeout=BATCH_RESULT_TIMEOUT)
+            except Exception as e:
+                future.cancel()
+                logger.error("Batched Clarifai analysis failed: %s", e)
+                return self._create_fallback_response(f"Clarifai workflow error: {str(e)}")
+        return self._predict_with_clarifai_workflow(image_bytes, image_url)
+    
+    def _predict_with_clarifai_workflow(self, image_bytes=None, image_url=None):
+        """
+        Internal method to analyze one image with its own workflow predict
+        call, bypassing the micro-batcher.
+        
         Args:
             image_bytes: Binary image data (if provided)
             image_url: URL to the image (used if image_bytes not provided)
@@ -121,66 +474,106 @@ class ImageAnalysisService:
             dict: Structured response with description, concepts, and metadata
         """
         try:
-            # Initialize workflow with the configured URL and authentication
-            workflow = Workflow(url=self.workflow_url, pat=self.pat)
-            current_app.logger.info(f"Created workflow with URL: {self.workflow_url}")
+            # Reuse the workflow client built at initialization
+            workflow = self._workflow
             
             # Select the appropriate prediction method based on available inputs
             if image_bytes:
-                current_app.logger.info("Predicting using image bytes")
+                logger.info("Predicting using image bytes")
                 response = workflow.predict_by_bytes(image_bytes, input_type="image")
             else:
-                current_app.logger.info(f"Predicting using URL: {image_url}")
+                logger.info("Predicting using URL: %s", image_url)
                 response = workflow.predict_by_url(image_url, input_type="image")
             
             # Process results from the workflow response
-            description = None
-            concepts = []
+            logger.debug("Workflow response status %s with %s results", response.status.code, len(response.results))
+            try:
+                description, concepts = self._parse_workflow_result(response.results[0])
+            except (AttributeError, IndexError):
+                description, concepts = None, []
             
-            # Extract data from potentially nested response structure
-            if hasattr(response, 'results') and response.results:
-                result = response.results[0]  # Get the first result
-                current_app.logger.info(f"Got result with {len(result.outputs) if hasattr(result, 'outputs') else 0} outputs")
-                
-                if hasattr(result, 'outputs') and result.outputs:
-                    for output in result.outputs:
-                        if hasattr(output, 'data'):
-                            # Extract text/caption data (typically from LLM or captioning models)
-                            if hasattr(output.data, 'text'):
-                                description = output.data.text.raw
-                                current_app.logger.info(f"Extracted caption: {description}")
-                            
-                            # Extract concept data (typically from classification models)
-                            if hasattr(output.data, 'concepts'):
-                                for concept in output.data.concepts:
-                                    # Filter out low-confidence predictions (threshold: 0.5)
-                                    if concept.value > 0.5:
-                                        concepts.append({
-                                            "name": concept.name,
-                                            "value": concept.value,
-                                            "model": output.model.id if hasattr(output, 'model') else "unknown"
-                                        })
-            
-            # Generate a description from concepts if none was provided by the models
-            if not description and concepts:
-                description = self.generate_description(concepts)
-                
-            # Sort concepts by confidence score for better presentation
-            concepts = sorted(concepts, key=lambda x: x['value'], reverse=True)
-            
-            return {
+            result = {
                 "description": description,
                 "concepts": concepts,
-                "workflow_url": self.workflow_url,
-                "raw_response": str(response)  # Serialized to string to avoid JSON serialization issues
+                "workflow_url": self.workflow_url
             }
+            # The full response is only kept when explicitly debugging the
+            # integration; converting it is costly
+            if current_app.config.get('DEBUG_CLARIFAI'):
+                result["raw_response"] = self._sdk.MessageToDict(response)
+            return result
             
         except Exception as e:
             # Comprehensive error logging with stack trace for debugging
-            current_app.logger.error(f"Clarifai workflow API error: {str(e)}")
-            current_app.logger.error(traceback.format_exc())
+            logger.exception("Clarifai workflow API error: %s", e)
             return self._create_fallback_response(f"Clarifai workflow error: {str(e)}")
     
+    def _parse_workflow_result(self, result):
+        """
+        Extract the caption and concepts from a single workflow result.
+        
+        Args:
+            result: One entry of a Clarifai workflow response's `results`
+            
+        Returns:
+            tuple: (description or None, top MAX_CONCEPTS concepts sorted by confidence)
+        """
+        description = None
+        # Qualifying concepts from every output, as parallel columns; a concept
+        # reported by several classifiers keeps its most confident prediction
+        names, values, models = [], [], []
+        add_name, add_value, add_model = names.append, values.append, models.append
+        index_of = {}
+        try:
+            outputs = result.outputs
+        except AttributeError:
+            outputs = []
+        logger.info("Got result with %s outputs", len(outputs))
+        
+        # Protobuf messages always expose these fields (empty when unset),
+        # so they are read directly rather than probed one by one
+        for output in outputs:
+            try:
+                data = output.data
+                # Extract text/caption data (typically from LLM or captioning models);
+                # outputs without a caption carry an empty string
+                if description is None:
+                    caption = data.text.raw
+                    if caption:
+                        description = caption
+                        logger.info("Extracted caption: %s", description)
+                
+                # Extract concept data (typically from classification models),
+                # filtering out low-confidence predictions as they are read
+                if data.concepts:
+                    model_id = output.model.id or "unknown"
+                    for concept in data.concepts:
+                        value = concept.value
+                        if value <= CONCEPT_THRESHOLD:
+                            continue
+                        name = concept.name
+                        i = index_of.get(name)
+                        if i is None:
+                            index_of[name] = len(names)
+                            add_name(name)
+                            add_value(value)
+                            add_model(model_id)
+                        elif value > values[i]:
+                            values[i] = value
+                            models[i] = model_id
+            except AttributeError:
+                continue
+        
+        # Keep the top concepts by confidence in a single bounded selection
+        # over the value column
+        top = heapq.nlargest(MAX_CONCEPTS, range(len(values)), key=values.__getitem__)
+        concepts = [Concept(names[i], values[i], models[i]) for i in top]
+        
+        # Generate a description from concepts if none was provided by the models
+        if not description and concepts:
+            description = self.generate_description(concepts, presorted=True)
+        return description, concepts
+    
     def _create_fallback_response(self, error_message):
         """
         Create a standardized fallback response structure for error cases.
@@ -192,7 +585,7 @@ class ImageAnalysisService:
         Returns:
             dict: Structured fallback response with error details and empty results
         """
-        current_app.logger.warning(f"Using fallback response: {error_message}")
+        logger.warning("Using fallback response: %s", error_message)
         return {
             "description": None,
             "concepts": [],
@@ -200,14 +593,16 @@ class ImageAnalysisService:
             "using_fallback": True
         }
     
-    def generate_description(self, concepts, max_concepts=5):
+    def generate_description(self, concepts, max_concepts=5, presorted=False):
         """
         Generate a natural language description from identified concepts.
         Creates human-readable text based on the confidence-ranked concepts.
         
         Args:
-            concepts: List of concept dictionaries with 'name' and 'value' (confidence score)
+            concepts: List of Concept tuples (name, value, model)
             max_concepts: Maximum number of concepts to include in the description
+            presorted: True if concepts are already ordered by descending
+                       confidence, so no ranking is needed
             
         Returns:
             str: A human-readable description sentence
@@ -215,20 +610,15 @@ class ImageAnalysisService:
         if not concepts:
             return None
             
-        # Sort concepts by confidence and take the top ones
-        sorted_concepts = sorted(concepts, key=lambda x: x['value'], reverse=True)
-        top_concepts = sorted_concepts[:max_concepts]
-        
-        # Extract just the concept names for the description
-        concept_names = [c['name'] for c in top_concepts]
-        
-        # Generate appropriate natural language based on number of concepts
-        if len(concept_names) == 1:
-            return f"This image appears to be a {concept_names[0]}."
-        elif len(concept_names) == 2:
-            return f"This image appears to contain {concept_names[0]} and {concept_names[1]}."
+        # Take the top concepts by confidence, ranking them only if needed
+        if presorted:
+            top_concepts = concepts[:max_concepts]
         else:
-            return "This image appears to contain " + ", ".join(concept_names[:-1]) + f", and {concept_names[-1]}."
+            top_concepts = heapq.nlargest(max_concepts, concepts, key=_concept_value)
+        concept_names = [c.name for c in top_concepts]
+        
+        # Pick the sentence template for the number of concepts
+        return _DESCRIPTION_TEMPLATES[min(len(concept_names), 3) - 1](concept_names)
 
 
 # Legacy alias for backward compatibility with code that may import the original name
@@ -1,22 +1,210 @@
 """
 ImageService: Central service for image operations in the application.
 Implements a facade pattern that orchestrates interactions between:
-- S3/R2 cloud storage (via S3Helper)
-- Image analysis (via ImageAnalysisService and Strategy pattern)
+- S3/R2 cloud storage (via the shared S3Helper)
+- Image analysis (via ImageAnalysisService and analysis strategy functions)
 - Database operations (via ImageRepository)
 
 This service separates business logic from controllers and repositories,
 enforcing proper separation of concerns in the application architecture.
 """
+import os
 import uuid
 import time
+import logging
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock, Thread
 from flask import current_app
-from app.utils.s3_helper import S3Helper
+from app.utils.s3_helper import get_s3_helper
 from app.repositories.image_repository import ImageRepository
-from app.services.image_analysis_service import ImageAnalysisService
-from app.services.analysis_strategies import FallbackAnalysisStrategy
+from app.services.image_analysis_service import ImageAnalysisService, MAX_BATCH_SIZE
+from app.services.analysis_strategies import STRATEGIES, analyze_fallback, needs_url
+from app.services.user_service import UserService
 from app.models.image import Image
 
+# Child of the Flask app logger ("app"), so records go through its handlers
+logger = logging.getLogger(__name__)
+
+# Background pool for storage cleanup that the client doesn't need to wait on
+_S3_GC = ThreadPoolExecutor(max_workers=4, thread_name_prefix="s3-gc")
+
+# Background pool for AI analysis of new uploads
+_ANALYSIS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis-task")
+
+# Pool for the concurrent storage uploads of a bulk upload
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="s3-upload")
+
+# Uploads up to this size are read into memory and analyzed from their bytes
+# while the storage upload runs; larger ones are streamed to storage without
+# being buffered and analyzed from a presigned URL afterwards
+INLINE_ANALYSIS_MAX_BYTES = 2 * 1024 * 1024
+
+# A bulk upload inlines small files only up to this many bytes in total (the
+# rest are analyzed from presigned URLs), and only this many bulk analyses per
+# process may hold inlined bytes at once
+BULK_INLINE_ANALYSIS_MAX_BYTES = 16 * 1024 * 1024
+_BULK_INLINE_SLOTS = BoundedSemaphore(4)
+
+# Largest file accepted in a bulk upload
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+
+def _upload_error(content_type, file_size):
+    """Return why a bulk-uploaded file is rejected, or None if it is acceptable."""
+    if not content_type or not content_type.startswith("image/"):
+        return "Only image files can be uploaded."
+    if file_size == 0:
+        return "File is empty."
+    if file_size > MAX_UPLOAD_BYTES:
+        return f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit."
+    return None
+
+
+def _delete_stored_object(s3_helper, s3_key):
+    """Delete an object from storage, logging failures (runs on the _S3_GC pool)."""
+    try:
+        s3_helper.delete_file(s3_key)
+    except Exception as e:
+        logger.error("S3 delete failed for %s: %s", s3_key, e)
+
+
+def _file_size(file_obj):
+    """
+    Size in bytes of an uploaded file, without moving its read position.
+    Seeking to the end is a pointer move for both in-memory and disk-backed
+    uploads, and never forces a spooled upload to disk.
+    """
+    stream = getattr(file_obj, "stream", file_obj)
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+def _run_analysis_task(app, image_service, image_bytes=None, s3_key=None):
+    """Run ImageService.analyze_content inside an app context (on _ANALYSIS_POOL)."""
+    with app.app_context():
+        return image_service.analyze_content(image_bytes=image_bytes, s3_key=s3_key)
+
+
+def _record_analysis(app, image_id, future):
+    """
+    Store a finished analysis on its image row. Attached as a done-callback
+    to the analysis future once the row exists, so it runs on the analysis
+    worker (or immediately, if the analysis already finished).
+    """
+    with app.app_context():
+        try:
+            ai_description, status = future.result()
+        except Exception as e:
+            logger.error("Analysis task failed for image %s: %s", image_id, e)
+            ai_description, status = None, Image.ANALYSIS_FAILED
+        _store_analysis(image_id, ai_description, status)
+
+
+def _store_analysis(image_id, ai_description, status):
+    """Write one analysis outcome to its image row, logging rather than raising."""
+    try:
+        if not ImageRepository.update_analysis(image_id, ai_description, status):
+            logger.info("Image %s was deleted before its analysis finished", image_id)
+    except Exception as e:
+        logger.error("Could not store analysis for image %s: %s", image_id, e)
+
+
+def _analysis_outcome(analysis_result):
+    """
+    Turn an analysis result dict into (AI description or None, Image.ANALYSIS_* status),
+    logging why no description was produced.
+    """
+    if analysis_result.get('description') and not analysis_result.get('using_fallback', False):
+        ai_description = analysis_result['description']
+        logger.info("Generated AI description: %s", ai_description)
+        return ai_description, Image.ANALYSIS_COMPLETE
+    elif analysis_result.get('using_fallback'):
+        logger.warning("Using fallback response: %s", analysis_result.get('error'))
+    else:
+        logger.warning("Failed to generate AI description")
+    return None, Image.ANALYSIS_FAILED
+
+
+def _run_bulk_analysis_task(app, image_service, image_ids, inputs, inline_slot=False):
+    """
+    Analyze a bulk upload with batched provider calls and store each outcome
+    on its image row (runs on _ANALYSIS_POOL). The lists are consumed one
+    provider batch at a time, so each batch's image bytes are released as
+    soon as it is analyzed; an inline slot taken by the upload is released
+    when the task ends.
+    """
+    try:
+        with app.app_context():
+            while inputs:
+                batch_ids, batch = image_ids[:MAX_BATCH_SIZE], inputs[:MAX_BATCH_SIZE]
+                del image_ids[:MAX_BATCH_SIZE], inputs[:MAX_BATCH_SIZE]
+                try:
+                    results = image_service.analysis_service.analyze_images(batch)
+                except Exception as e:
+                    logger.error("Bulk AI analysis error: %s", e)
+                    results = [{"using_fallback": True, "error": str(e)}] * len(batch)
+                del batch
+                for image_id, result in zip(batch_ids, results):
+                    _store_analysis(image_id, *_analysis_outcome(result))
+    finally:
+        if inline_slot:
+            _BULK_INLINE_SLOTS.release()
+
+
+# Per-process thread that re-submits analyses lost with a previous worker
+_sweeper = None
+_sweeper_lock = Lock()
+
+
+def _ensure_analysis_sweeper(app):
+    """
+    Start this process's stale-analysis sweeper on first use. It is started
+    lazily rather than in the app factory so that, with `gunicorn --preload`,
+    every forked worker runs its own thread.
+    """
+    global _sweeper
+    if _sweeper is None or not _sweeper.is_alive():
+        with _sweeper_lock:
+            if _sweeper is None or not _sweeper.is_alive():
+                _sweeper = Thread(
+                    target=_sweep_stale_analyses, args=(app,), name="analysis-sweeper", daemon=True
+                )
+                _sweeper.start()
+
+
+def _sweep_stale_analyses(app):
+    """Sweeper loop: re-submit stale analyses every ANALYSIS_SWEEP_INTERVAL_SECONDS."""
+    interval = app.config.get('ANALYSIS_SWEEP_INTERVAL_SECONDS', 60)
+    while True:
+        with app.app_context():
+            try:
+                ImageService().resubmit_stale_analyses()
+            except Exception as e:
+                logger.exception("Stale analysis sweep failed: %s", e)
+        time.sleep(interval)
+
+
+def _get_default_analysis_service():
+    """
+    Return the app-wide ImageAnalysisService, registered as a Flask extension.
+    It is built (and the provider SDK imported) the first time this process
+    analyzes an image, i.e. on its first upload or re-submitted analysis,
+    rather than in the app factory; requests that only read or delete images
+    never reach it (see ImageService.analysis_service). Every worker that
+    serves uploads still loads the SDK once, after which config validation
+    and client setup never run per request.
+    """
+    analysis_service = current_app.extensions.get('image_analysis')
+    if analysis_service is None:
+        analysis_provider = current_app.config.get('IMAGE_ANALYSIS_PROVIDER', 'clarifai')
+        analysis_service = current_app.extensions.setdefault(
+            'image_analysis', ImageAnalysisService(provider=analysis_provider)
+        )
+    return analysis_service
+
 
 class ImageService:
     def __init__(self, analysis_service=None, analysis_strategy=None):
@@ -27,27 +215,46 @@ class ImageService:
         
         Args:
             analysis_service: Optional ImageAnalysisService instance for AI analysis
-            analysis_strategy: Optional AnalysisStrategy instance for analysis method selection
-        """
-        # Dependency injection for the analysis service
-        if analysis_service is None:
-            # Only create a default if none was provided
-            analysis_provider = current_app.config.get('IMAGE_ANALYSIS_PROVIDER', 'clarifai')
-            self.analysis_service = ImageAnalysisService(provider=analysis_provider)
-        else:
-            self.analysis_service = analysis_service
+            analysis_strategy: Optional strategy function, or its name in STRATEGIES
+                               ('url', 'bytes', 'fallback'), for analysis method selection
+        """
+        # Dependency injection for the analysis service; the default is only
+        # resolved when an analysis actually runs (see analysis_service)
+        self._analysis_service = analysis_service
             
         # Dependency injection for the analysis strategy
-        # Default to FallbackAnalysisStrategy for maximum reliability
-        self.analysis_strategy = analysis_strategy or FallbackAnalysisStrategy()
+        # Default to the fallback strategy for maximum reliability
+        if isinstance(analysis_strategy, str):
+            analysis_strategy = STRATEGIES[analysis_strategy]
+        self.analysis_strategy = analysis_strategy or analyze_fallback
+        
+        # Process-wide storage client, reused across requests
+        self.s3_helper = get_s3_helper()
+        
+        # Recover analyses lost by a restarted worker
+        _ensure_analysis_sweeper(current_app._get_current_object())
+
+    @property
+    def analysis_service(self):
+        """
+        The ImageAnalysisService used for uploads. The app-wide default is
+        looked up on first access, so requests that only read or delete
+        images never construct it or import the provider SDK.
+        """
+        if self._analysis_service is None:
+            self._analysis_service = _get_default_analysis_service()
+        return self._analysis_service
 
     def upload_image(self, user_id, file_obj, original_filename, content_type, metadata=None):
         """
-        Complete image upload workflow:
+        Image upload workflow:
         1. Generate unique storage key
-        2. Upload file to cloud storage (S3/R2)
-        3. Perform AI analysis of content using selected strategy
-        4. Store metadata and analysis results in database
+        2. For small files, start AI analysis of the content on a background
+           worker from its bytes, so it runs concurrently with the upload
+        3. Stream the file to cloud storage (S3/R2)
+        4. Store metadata in database with a pending analysis status; the
+           description is filled in when the analysis finishes (large files
+           are analyzed from a presigned URL once stored)
         
         Args:
             user_id: ID of the uploading user (for permission and organization)
@@ -64,52 +271,29 @@ class ImageService:
         s3_key = f"{user_id}/{int(time.time())}_{uuid.uuid4().hex}_{original_filename}"
         
         # Get file size for database storage before reading content
-        file_obj.seek(0, 2)  # Move to end to get size
-        file_size = file_obj.tell()
-        file_obj.seek(0)  # Reset to beginning of file
+        file_size = _file_size(file_obj)
         
-        # Read file content for analysis while preserving file pointer
-        file_content = file_obj.read()
-        file_obj.seek(0)  # Reset pointer for S3 upload
+        # Small files: analysis only needs the bytes, so it overlaps with the
+        # storage upload. Large files are never buffered whole in memory, and
+        # URL-only strategies have to wait for the object to be stored.
+        app = current_app._get_current_object()
+        analysis_future = None
+        if file_size <= INLINE_ANALYSIS_MAX_BYTES and not needs_url(self.analysis_strategy):
+            file_content = file_obj.read()
+            file_obj.seek(0)  # Reset pointer for S3 upload
+            analysis_future = _ANALYSIS_POOL.submit(_run_analysis_task, app, self, image_bytes=file_content)
+            del file_content  # Only the analysis task needs it now
         
         # Upload to S3/R2 storage
-        s3_helper = S3Helper()
         try:
-            s3_url = s3_helper.upload_file(file_obj, s3_key, content_type)
+            self.s3_helper.upload_file(file_obj, s3_key, content_type)
         except Exception as e:
             # Early return if storage upload fails
+            if analysis_future is not None:
+                analysis_future.cancel()
             return None, f"Image upload failed: {str(e)}"
-        
-        # Initialize AI description field
-        ai_description = None
-        
-        # Analyze the image with AI service using the strategy pattern
-        try:
-            # Create a pre-signed URL with 1-hour expiration for external services
-            analysis_url = s3_helper.get_presigned_url(s3_key, expires=3600)
-            
-            # Use the analysis strategy to handle the analysis workflow
-            # Strategy pattern delegates decision making about using URL vs bytes
-            analysis_result = self.analysis_strategy.analyze(
-                analysis_service=self.analysis_service,
-                image_bytes=file_content,
-                image_url=analysis_url
-            )
-                
-            # Extract the AI-generated description with error handling
-            if analysis_result.get('description') and not analysis_result.get('using_fallback', False):
-                ai_description = analysis_result['description']
-                current_app.logger.info(f"Generated AI description: {ai_description}")
-            elif analysis_result.get('using_fallback'):
-                current_app.logger.warning(f"Using fallback response: {analysis_result.get('error')}")
-            else:
-                current_app.logger.warning("Failed to generate AI description")
-        except Exception as e:
-            # Log the error but continue with upload process
-            # This ensures upload succeeds even if AI analysis fails
-            current_app.logger.error(f"AI analysis error: {str(e)}")
 
-        # Create image record in database with all collected metadata
+        # Create image record in database; the description follows once analyzed
         image = Image(
             filename=s3_key,
             original_filename=original_filename,
@@ -117,18 +301,187 @@ class ImageService:
             upload_date=None,  # Let DB default handle with current timestamp
             file_size=file_size,
             file_type=content_type,
-            ai_description=ai_description,  # May be None if analysis failed
+            ai_description=None,
+            analysis_status=Image.ANALYSIS_PENDING,
             user_id=user_id
         )
         
         # Persist to database
         ImageRepository.create(image)
+        # The cached profile lists the user's image ids
+        UserService.invalidate_profile(user_id)
+        
+        # Otherwise analyze from storage now that the object exists
+        if analysis_future is None:
+            analysis_future = _ANALYSIS_POOL.submit(_run_analysis_task, app, self, s3_key=s3_key)
+        
+        # Record the analysis once it finishes; clients poll the analysis endpoint
+        image_id = image.id
+        analysis_future.add_done_callback(
+            lambda future: _record_analysis(app, image_id, future)
+        )
         return image, None
 
+    def bulk_upload(self, user_id, files):
+        """
+        Upload several images in one request:
+        1. Validate each file as a single upload would, rejecting it alone
+        2. Stream every accepted file to cloud storage (S3/R2) concurrently
+        3. Store the metadata of all stored files with a single batched insert
+        4. Analyze them in the background with batched provider calls
+           (up to the provider's batch size per request) instead of one
+           call per image; small files are sent as bytes while the inline
+           budget lasts, the others by presigned URL. The analysis
+           strategy is not used here.
+        
+        Args:
+            user_id: ID of the uploading user
+            files: List of (file_obj, original_filename, content_type) tuples
+            
+        Returns:
+            tuple: (list of created Image instances, list of
+                    {"filename", "error"} dicts for files that were
+                    rejected or could not be stored)
+        """
+        prefix = f"{user_id}/{int(time.time())}"
+        errors = []
+        inline_slot = False
+        submitted = False
+        try:
+            # Inline bytes only while this process has a free slot and the
+            # request's byte budget lasts; the slot is released below unless
+            # the analysis task takes it over
+            inline_slot = _BULK_INLINE_SLOTS.acquire(blocking=False)
+            inline_budget = BULK_INLINE_ANALYSIS_MAX_BYTES if inline_slot else 0
+            uploads = []  # (file_obj, original_filename, content_type, s3_key, file_size, image_bytes)
+            for file_obj, original_filename, content_type in files:
+                file_size = _file_size(file_obj)
+                error = _upload_error(content_type, file_size)
+                if error:
+                    errors.append({"filename": original_filename, "error": error})
+                    continue
+                s3_key = f"{prefix}_{uuid.uuid4().hex}_{original_filename}"
+                image_bytes = None
+                if file_size <= min(INLINE_ANALYSIS_MAX_BYTES, inline_budget):
+                    image_bytes = file_obj.read()
+                    file_obj.seek(0)  # Reset pointer for S3 upload
+                    inline_budget -= file_size
+                uploads.append((file_obj, original_filename, content_type, s3_key, file_size, image_bytes))
+
+            # Upload to S3/R2 storage in parallel
+            futures = [
+                _UPLOAD_POOL.submit(self.s3_helper.upload_file, file_obj, s3_key, content_type)
+                for file_obj, _, content_type, s3_key, _, _ in uploads
+            ]
+            images, inputs = [], []
+            for (_, original_filename, content_type, s3_key, file_size, image_bytes), future in zip(uploads, futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append({"filename": original_filename, "error": f"Image upload failed: {str(e)}"})
+                    continue
+                images.append(Image(
+                    filename=s3_key,
+                    original_filename=original_filename,
+                    s3_key=s3_key,
+                    upload_date=None,  # Let DB default handle with current timestamp
+                    file_size=file_size,
+                    file_type=content_type,
+                    ai_description=None,
+                    analysis_status=Image.ANALYSIS_PENDING,
+                    user_id=user_id
+                ))
+                # Bytes in memory need no presigned URL
+                image_url = None
+                if image_bytes is None:
+                    image_url = self.s3_helper.get_presigned_url(s3_key, expires=3600)
+                inputs.append((image_bytes, image_url))
+            # Only the analysis task holds the bytes from here on
+            del uploads
+            if not images:
+                return [], errors
+
+            # Persist all records at once
+            ImageRepository.bulk_create(images)
+            UserService.invalidate_profile(user_id)
+
+            # One background task analyzes the whole batch
+            app = current_app._get_current_object()
+            _ANALYSIS_POOL.submit(
+                _run_bulk_analysis_task, app, self, [image.id for image in images], inputs, inline_slot
+            )
+            submitted = True
+        finally:
+            if inline_slot and not submitted:
+                _BULK_INLINE_SLOTS.release()
+        return images, errors
+
+    def resubmit_stale_analyses(self, limit=100):
+        """
+        Re-submit analyses still pending ANALYSIS_STALE_AFTER_SECONDS after
+        they were submitted, which happens when the worker running them
+        restarted or crashed. Each image is claimed first, so when several
+        workers sweep at once only one of them restarts it.
+        
+        Args:
+            limit: Maximum number of analyses to re-submit in this sweep
+            
+        Returns:
+            int: Number of analyses re-submitted
+        """
+        app = current_app._get_current_object()
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=app.config.get('ANALYSIS_STALE_AFTER_SECONDS', 600))
+        resubmitted = 0
+        for row in ImageRepository.list_stale_pending(cutoff, limit=limit):
+            if not ImageRepository.claim_analysis(row.id, row.analysis_started_at, now):
+                continue
+            logger.warning("Re-submitting stale analysis of image %s", row.id)
+            future = _ANALYSIS_POOL.submit(_run_analysis_task, app, self, s3_key=row.s3_key)
+            future.add_done_callback(
+                lambda future, image_id=row.id: _record_analysis(app, image_id, future)
+            )
+            resubmitted += 1
+        return resubmitted
+
+    def analyze_content(self, image_bytes=None, s3_key=None):
+        """
+        Analyze image content with the selected strategy, from its bytes or,
+        when those aren't in memory, from a presigned URL to the stored object.
+        Runs on the background analysis pool; failures are reported as a
+        failed analysis and never affect the stored image.
+        
+        Args:
+            image_bytes: Binary image data (takes precedence if provided)
+            s3_key: Storage key of the image (used if image_bytes not provided)
+            
+        Returns:
+            tuple: (AI description or None, Image.ANALYSIS_* status)
+        """
+        # Analyze the image with AI service using the selected strategy
+        try:
+            # Bytes in memory need no presigned URL round-trip through storage
+            analysis_url = None
+            if image_bytes is None:
+                # Pre-signed URL with 1-hour expiration for external services
+                analysis_url = self.s3_helper.get_presigned_url(s3_key, expires=3600)
+            analysis_result = self.analysis_strategy(
+                self.analysis_service,
+                image_bytes=image_bytes,
+                image_url=analysis_url
+            )
+                
+            # Extract the AI-generated description with error handling
+            return _analysis_outcome(analysis_result)
+        except Exception as e:
+            # Log the error; the upload itself is unaffected
+            logger.exception("AI analysis error: %s", e)
+        return None, Image.ANALYSIS_FAILED
+
     def delete_image(self, user_id, image_id):
         """
-        Delete an image completely from both storage and database.
-        Includes ownership verification for security.
+        Delete an image completely from both database and storage.
+        Ownership is enforced by the delete statement itself.
         
         Args:
             user_id: ID of the requesting user (for permission check)
@@ -137,39 +490,32 @@ class ImageService:
         Returns:
             tuple: (success boolean, error message or None)
         """
-        # Get image record from database
-        image = ImageRepository.get_by_id(image_id)
+        # Delete the record (only if owned by the user) and get its storage key back
+        s3_key = ImageRepository.delete_by_id_and_user(image_id, user_id)
         
-        # Handle non-existent image
-        if not image:
+        # Handle non-existent image or image owned by someone else
+        if not s3_key:
             return False, "Image not found."
+        UserService.invalidate_profile(user_id)
             
-        # Security check: verify ownership before deletion
-        if image.user_id != user_id:
-            return False, "Unauthorized to delete this image."
-            
-        # Delete from S3/R2 storage first
-        s3_helper = S3Helper()
-        try:
-            s3_helper.delete_file(image.s3_key)
-        except Exception as e:
-            return False, f"S3 delete failed: {str(e)}"
-            
-        # If storage deletion successful, remove database record
-        ImageRepository.delete(image)
+        # Remove the stored object in the background; the record is already
+        # gone, so a storage failure only leaves an orphaned object behind
+        _S3_GC.submit(_delete_stored_object, self.s3_helper, s3_key)
         return True, None
 
-    def list_user_images(self, user_id):
+    def list_user_images(self, user_id, limit=None, offset=0):
         """
-        Retrieve all images belonging to a specific user.
+        Retrieve images belonging to a specific user, newest first.
         
         Args:
             user_id: ID of the user whose images to retrieve
+            limit: Optional page size (None returns every image)
+            offset: Number of images to skip for pagination
             
         Returns:
-            list: Collection of Image model instances
+            list: Collection of projected image rows (see ImageRepository.list_by_user)
         """
-        return ImageRepository.list_by_user(user_id)
+        return ImageRepository.list_by_user(user_id, limit=limit, offset=offset)
 
     def get_image(self, user_id, image_id):
         """
@@ -2,33 +2,138 @@
 UserService: Contains business logic for user operations.
 Orchestrates calls to UserRepository and handles validation, password hashing, etc.
 """
+import os
+import hmac
+import hashlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from cachetools import TTLCache
+from sqlalchemy.exc import IntegrityError
+from app import db
 from app.repositories.user_repository import UserRepository
-from app.models.user import User
+from app.models.user import (
+    User, hash_password, verify_password_hash, password_hash_needs_rehash, verify_dummy_password
+)
+from flask import current_app
 from flask_jwt_extended import create_access_token
 
+# Read-only profile view: user columns plus the ids of the user's images
+UserProfile = namedtuple("UserProfile", "id username email created_at images")
+
+# What a login needs to check a password, as plain values
+UserCredentials = namedtuple("UserCredentials", "id password_hash")
+
+# Short-lived profile cache keyed by user id. Entries are immutable
+# UserProfile tuples, so they are shared between requests as they are.
+_profile_cache = TTLCache(maxsize=10_000, ttl=30)
+_profile_cache_lock = Lock()
+
+# Credential lookups by username and by email. Entries are immutable
+# UserCredentials tuples, never ORM instances, so they can be shared between
+# threads and sessions; logins answer with the cached UserProfile, so a warm
+# login runs no query. Only found users are cached, so a new registration is
+# never hidden; anything that changes a password must call invalidate_user.
+_credentials_by_name = TTLCache(maxsize=10_000, ttl=600)
+_credentials_by_email = TTLCache(maxsize=10_000, ttl=600)
+_credentials_lock = Lock()
+
+
+def _remember_credentials(user):
+    """Cache a user's credentials under both login keys and return them."""
+    credentials = UserCredentials(user.id, user.password_hash)
+    with _credentials_lock:
+        _credentials_by_name[user.username] = credentials
+        _credentials_by_email[user.email] = credentials
+    return credentials
+
+
+# Recently verified credentials: user id -> HMAC of (id, password hash, password)
+# under a per-process random key, so repeat logins skip the password hash.
+# The stored hash is part of the MAC, so a password change never matches an
+# old entry; nothing here can be reversed to the password outside the process.
+_auth_cache = TTLCache(maxsize=50_000, ttl=1800)
+_auth_cache_lock = Lock()
+_AUTH_CACHE_KEY = os.urandom(32)
+
+
+# Longest possible email address; longer logins can never match a user
+MAX_LOGIN_LENGTH = 254
+
+# Upper bound for one page of list_users
+MAX_USER_PAGE_SIZE = 100
+
+# Password hashing runs on a per-process pool of PASSWORD_HASH_THREADS threads
+# (default: one per CPU). The bound is per process, so a host running N
+# workers hashes up to N times that many passwords at once; set it to about
+# cpu_count / N there. Each argon2 hash takes ARGON2_MEMORY_COST (64 MiB by
+# default), so a login burst queues instead of oversubscribing CPU and
+# memory; under gevent the waiting request yields to others while the
+# native hash runs. Built on first use, from the app config.
+_password_hash_pool = None
+_password_hash_pool_lock = Lock()
+
+
+def _hash_work(fn, *args):
+    """Run a password hashing call on _password_hash_pool and wait for it."""
+    global _password_hash_pool
+    if _password_hash_pool is None:
+        with _password_hash_pool_lock:
+            if _password_hash_pool is None:
+                threads = current_app.config.get("PASSWORD_HASH_THREADS") or os.cpu_count() or 1
+                _password_hash_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="password-hash")
+    return _password_hash_pool.submit(fn, *args).result()
+
+
+def _credential_digest(credentials, password):
+    """MAC binding a plaintext password to a user's current stored hash."""
+    message = f"{credentials.id}:{credentials.password_hash}:{password}".encode()
+    return hmac.new(_AUTH_CACHE_KEY, message, hashlib.sha256).digest()
+
+
+def _verify_password(credentials, password):
+    """
+    Check a password, answering from the verified-credential cache when the
+    same credentials were accepted recently; otherwise run the full hash check.
+    """
+    digest = _credential_digest(credentials, password)
+    with _auth_cache_lock:
+        cached = _auth_cache.get(credentials.id)
+    if cached is not None and hmac.compare_digest(cached, digest):
+        return True
+    if not _hash_work(verify_password_hash, credentials.password_hash, password):
+        return False
+    with _auth_cache_lock:
+        _auth_cache[credentials.id] = digest
+    return True
+
+
 class UserService:
     @staticmethod
     def register_user(data):
         """
         Register a new user:
         - Expects a dict of validated data (username, email, password)
-        - Check for existing username/email
         - Hash password
-        - Save user to DB
+        - Save user to DB; the unique constraints on username and email
+          reject duplicates, so no lookups precede the insert
         - Return a tuple: (user, access_token, error_message)
         """
         username = data["username"]
         email = data["email"]
         password = data["password"]
 
-        if UserRepository.get_by_username(username):
-            return None, "Username already exists."
-        if UserRepository.get_by_email(email):
-            return None, "Email already exists."
-
-        user = User(username=username, email=email)
-        user.set_password(password)
-        UserRepository.create(user)
+        user = User(username=username, email=email, password_hash=_hash_work(hash_password, password))
+        try:
+            UserRepository.create(user)
+        except IntegrityError:
+            db.session.rollback()
+            # Only on a conflict: find out which unique column collided
+            if UserRepository.get_by_username(username):
+                return None, None, "Username already exists."
+            return None, None, "Email already exists."
+        # Cache the new credentials so the first login doesn't miss
+        _remember_credentials(user)
         access_token = create_access_token(identity=str(user.id))
         return user, access_token, None 
 
@@ -38,28 +143,106 @@ class UserService:
         Authenticate user by username/email and password.
         - Expects a dict with 'username_or_email' and 'password'.
         - Determines if input is email or username.
-        - Looks up user accordingly and checks password.
-        - Returns (user, access_token, None) if successful, (None, None, error) otherwise.
+        - Looks up the credentials accordingly (cached) and checks password.
+        - Returns (UserProfile, access_token, None) if successful, (None, None, error) otherwise.
         """
         username_or_email = data["username_or_email"]
         password = data["password"]
 
+        # Inputs that can't name any user need neither a lookup nor a hash
+        if not 1 <= len(username_or_email) <= MAX_LOGIN_LENGTH:
+            return None, None, "Invalid credentials."
+
         if "@" in username_or_email:
-            user = UserRepository.get_by_email(username_or_email)
+            cache, load = _credentials_by_email, UserRepository.get_by_email
         else:
-            user = UserRepository.get_by_username(username_or_email)
+            cache, load = _credentials_by_name, UserRepository.get_by_username
+        with _credentials_lock:
+            credentials = cache.get(username_or_email)
+        if credentials is None:
+            user = load(username_or_email)
+            if user:
+                credentials = _remember_credentials(user)
 
-        if not user or not user.check_password(password):
+        if credentials is None:
+            # Hash anyway, so unknown users can't be told apart by timing
+            _hash_work(verify_dummy_password, password)
             return None, None, "Invalid credentials."
-        access_token = create_access_token(identity=str(user.id))
-        return user, access_token, None
+        if not _verify_password(credentials, password):
+            return None, None, "Invalid credentials."
+        # Upgrade legacy or outdated hashes while we have the plaintext; the
+        # only login that needs the User row itself
+        if password_hash_needs_rehash(credentials.password_hash):
+            user = UserRepository.get_by_id(credentials.id)
+            if user is not None:
+                user.password_hash = _hash_work(hash_password, password)
+                UserRepository.save(user)
+                UserService.invalidate_user(user)
+        # Respond with the cached profile rather than loading the User and
+        # its images; None means the user was deleted since it was cached
+        profile = UserService.get_user_profile(credentials.id)
+        if profile is None:
+            with _credentials_lock:
+                cache.pop(username_or_email, None)
+            return None, None, "Invalid credentials."
+        access_token = create_access_token(identity=str(profile.id))
+        return profile, access_token, None
+
+    @staticmethod
+    def invalidate_user(user):
+        """Drop every cached view of a user after it is updated or deleted."""
+        with _credentials_lock:
+            _credentials_by_name.pop(user.username, None)
+            _credentials_by_email.pop(user.email, None)
+        UserService.invalidate_profile(user.id)
+        UserService.invalidate_auth(user.id)
+
+    @staticmethod
+    def invalidate_auth(user_id):
+        """Forget a user's verified credentials, e.g. after a password change."""
+        with _auth_cache_lock:
+            _auth_cache.pop(user_id, None)
 
     @staticmethod
     def get_user_profile(user_id):
-        """Return user profile data."""
-        return UserRepository.get_by_id(user_id)
+        """
+        Return a UserProfile (or None if the user doesn't exist), served from
+        a short-TTL cache when possible and otherwise read with one projected
+        query instead of loading the User and its images.
+        """
+        with _profile_cache_lock:
+            cached = _profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        rows = UserRepository.get_profile_rows(user_id)
+        if not rows:
+            return None
+        first = rows[0]
+        profile = UserProfile(
+            first.id, first.username, first.email, first.created_at,
+            tuple(row.image_id for row in rows if row.image_id is not None)
+        )
+        with _profile_cache_lock:
+            _profile_cache[user_id] = profile
+        return profile
 
     @staticmethod
-    def list_users():
-        """List all users."""
-        return UserRepository.list_all()
+    def invalidate_profile(user_id):
+        """Drop a cached profile after the user or their images change."""
+        with _profile_cache_lock:
+            _profile_cache.pop(user_id, None)
+
+    @staticmethod
+    def list_users(after_id=0, limit=MAX_USER_PAGE_SIZE):
+        """
+        List users a page at a time, as projected (id, username, email, created_at) rows.
+        - limit must be at least 1 (ValueError otherwise) and is capped at MAX_USER_PAGE_SIZE
+        Returns a tuple: (rows, id to pass as after_id for the next page, or None on the last page)
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(limit, MAX_USER_PAGE_SIZE)
+        rows = UserRepository.list_page_projected(after_id=after_id, limit=limit)
+        next_after_id = rows[-1].id if rows and len(rows) == limit else None
+        return rows, next_after_id
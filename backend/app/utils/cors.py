@@ -0,0 +1,70 @@
+"""
+CORS support for the API blueprints.
+
+All static header values are computed once when the app is created; per request
+the only work is reflecting the caller's Origin (required when credentials are
+allowed, since browsers reject a wildcard origin in that case). Preflight
+requests are answered in before_request, so they never reach a view function.
+"""
+from flask import request
+
+API_PREFIX = "/api/"
+
+ALLOW_HEADERS = ["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"]
+ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+EXPOSE_HEADERS = ["Content-Disposition"]  # For file downloads if needed
+PREFLIGHT_MAX_AGE = 600
+
+
+def init_cors(app):
+    """
+    Register CORS handlers on the app.
+
+    Allowed origins come from the CORS_ORIGINS config value (a comma-separated
+    list); "*" allows any origin. In production, set it to your frontend URL.
+    """
+    origins = {o.strip() for o in app.config.get("CORS_ORIGINS", "*").split(",") if o.strip()}
+    allow_all = "*" in origins
+
+    # Headers sent on every CORS response
+    cors_headers = {
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Expose-Headers": ", ".join(EXPOSE_HEADERS),
+    }
+    # Extra headers sent only on preflight responses
+    preflight_headers = {
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Allow-Headers": ", ".join(ALLOW_HEADERS),
+        "Access-Control-Allow-Methods": ", ".join(ALLOW_METHODS),
+        "Access-Control-Max-Age": str(PREFLIGHT_MAX_AGE),
+    }
+
+    def _allowed_origin():
+        origin = request.headers.get("Origin")
+        if not origin or not request.path.startswith(API_PREFIX):
+            return None
+        if allow_all or origin in origins:
+            return origin
+        return None
+
+    @app.before_request
+    def _handle_preflight():
+        if request.method != "OPTIONS" or "Access-Control-Request-Method" not in request.headers:
+            return None
+        origin = _allowed_origin()
+        if origin is None:
+            return None
+        response = app.response_class(status=204)
+        response.headers.update(preflight_headers)
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.vary.add("Origin")
+        return response
+
+    @app.after_request
+    def _add_cors_headers(response):
+        origin = _allowed_origin()
+        if origin is not None and "Access-Control-Allow-Origin" not in response.headers:
+            response.headers.update(cors_headers)
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.vary.add("Origin")
+        return response
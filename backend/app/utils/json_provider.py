@@ -0,0 +1,41 @@
+"""
+JSON provider backed by orjson, used by jsonify() and request.get_json().
+Falls back to Flask's default provider when orjson is not installed.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Naive datetimes are stored as UTC throughout the app
+_ORJSON_OPTIONS = 0
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serialize with orjson's C encoder instead of the stdlib json module.
+    Types orjson doesn't handle natively (Decimal, objects with __html__, ...)
+    go through the provider's default conversion hook.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = _ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def init_json_provider(app):
+    """Install the orjson provider on the app if orjson is available."""
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
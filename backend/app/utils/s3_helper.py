@@ -1,7 +1,64 @@
-import boto3
-from botocore.exceptions import ClientError
+import importlib
+from functools import lru_cache
+from threading import Lock
+from types import SimpleNamespace
+from urllib.parse import quote
+from cachetools import TLRUCache
 from flask import current_app
 
+# Multipart settings for uploads: files above 8 MiB are split into 8 MiB parts
+# sent concurrently; smaller files still go up as a single PUT
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+TRANSFER_SETTINGS = dict(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Client settings: enough pooled keep-alive connections for concurrent request
+# threads plus multipart workers, and adaptive retries for throttling
+CLIENT_SETTINGS = dict(
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+
+@lru_cache(maxsize=1)
+def _load_boto3():
+    """
+    Import boto3 on first use. It loads botocore's service models (well over
+    100ms and ~18MB), which processes that never touch storage, such as CLI
+    commands, skip entirely.
+    """
+    boto3 = importlib.import_module("boto3")
+    transfer = importlib.import_module("boto3.s3.transfer")
+    botocore_config = importlib.import_module("botocore.config")
+    exceptions = importlib.import_module("botocore.exceptions")
+    return SimpleNamespace(
+        client=boto3.client,
+        ClientError=exceptions.ClientError,
+        client_config=botocore_config.Config(**CLIENT_SETTINGS),
+        transfer_config=transfer.TransferConfig(**TRANSFER_SETTINGS),
+    )
+
+
+# Presigned GET URLs by (bucket, key) -> (expires, url). A URL is handed out
+# again only during the first half of its validity, so callers always get
+# at least half of the requested lifetime; repeat requests skip the signing.
+_presigned_url_cache = TLRUCache(maxsize=10_000, ttu=lambda _key, value, now: now + value[0] / 2)
+_presigned_url_cache_lock = Lock()
+
+
+@lru_cache(maxsize=1)
+def get_s3_helper():
+    """
+    Return the process-wide S3Helper, built on first use inside an app context.
+    boto3 clients are thread-safe, so one client (and its connection pool) is
+    shared by every request instead of creating a session per call.
+    """
+    return S3Helper()
+
 class S3Helper:
     """
     Helper class for S3-compatible storage operations (AWS S3, Cloudflare R2, etc.)
@@ -31,8 +88,16 @@ class S3Helper:
             client_kwargs['endpoint_url'] = endpoint
             
         # Initialize the boto3 S3 client with our configuration
-        self.s3_client = boto3.client('s3', **client_kwargs)
+        self._sdk = _load_boto3()
+        self.s3_client = self._sdk.client('s3', config=self._sdk.client_config, **client_kwargs)
         self.bucket = current_app.config['S3_BUCKET_NAME']
+        
+        # Base of plain object URLs: path-style on custom endpoints (R2 endpoints
+        # are per account), virtual-hosted style on AWS
+        if endpoint:
+            self.object_url_base = f"{endpoint.rstrip('/')}/{self.bucket}"
+        else:
+            self.object_url_base = f"https://{self.bucket}.s3.{region or 'us-east-1'}.amazonaws.com"
 
     def upload_file(self, file_obj, key, content_type):
         """
@@ -44,36 +109,49 @@ class S3Helper:
             content_type: MIME type of the file (e.g., 'image/jpeg')
             
         Returns:
-            str: Generated URL for the uploaded file
+            str: Unsigned URL of the uploaded object (readable only if the
+                 bucket or object is public)
             
         Raises:
             RuntimeError: If upload fails due to S3 errors
         """
         try:
-            # Use Boto3 to upload the file with specified metadata
+            # Use Boto3 to upload the file with specified metadata,
+            # in parallel multipart chunks for large files
             self.s3_client.upload_fileobj(
                 file_obj,
                 self.bucket,
                 key,
-                ExtraArgs={'ContentType': content_type}
+                ExtraArgs={'ContentType': content_type},
+                Config=self._sdk.transfer_config
             )
             
-            # Generate a URL to access the file after upload
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket, 'Key': key},
-                ExpiresIn=0  # 0 means no expiration, or set as needed
-            )
-            return url
-        except ClientError as e:
+            # Plain object URL; no signing, callers that need private access
+            # use get_presigned_url
+            return self.object_url(key)
+        except self._sdk.ClientError as e:
             # Wrap boto3 exceptions with our custom exception for better error handling
             # Use 'from e' to preserve the original exception chain for debugging
             raise RuntimeError(f"S3 upload failed: {e}") from e
             
+    def object_url(self, key):
+        """
+        Build the plain (unsigned) URL of an object.
+        
+        Args:
+            key (str): The S3 object key (path within bucket)
+            
+        Returns:
+            str: Object URL; only usable directly for public objects
+        """
+        return f"{self.object_url_base}/{quote(key)}"
+
     def get_presigned_url(self, key, expires=3600):
         """
         Generate a pre-signed URL for an object with a specified expiration time.
         Pre-signed URLs allow temporary direct access to private S3 objects.
+        Recently signed URLs with the same expiration are reused while at
+        least half of their validity remains.
         
         Args:
             key (str): The S3 object key (path within bucket)
@@ -82,14 +160,21 @@ class S3Helper:
         Returns:
             str: Pre-signed URL with expiration timeout, or None if generation fails
         """
+        cache_key = (self.bucket, key)
+        with _presigned_url_cache_lock:
+            cached = _presigned_url_cache.get(cache_key)
+        if cached is not None and cached[0] == expires:
+            return cached[1]
         try:
             url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket, 'Key': key},
                 ExpiresIn=expires
             )
+            with _presigned_url_cache_lock:
+                _presigned_url_cache[cache_key] = (expires, url)
             return url
-        except ClientError as e:
+        except self._sdk.ClientError as e:
             # Log the error but don't raise to avoid disrupting the caller
             current_app.logger.error(f"Failed to generate presigned URL: {str(e)}")
             return None
@@ -104,8 +189,10 @@ class S3Helper:
         Raises:
             RuntimeError: If deletion fails due to S3 errors
         """
+        with _presigned_url_cache_lock:
+            _presigned_url_cache.pop((self.bucket, key), None)
         try:
             self.s3_client.delete_object(Bucket=self.bucket, Key=key)
-        except ClientError as e:
+        except self._sdk.ClientError as e:
             # Wrap boto3 exceptions with our custom exception for better error handling
             raise RuntimeError(f"S3 delete failed: {e}") from e
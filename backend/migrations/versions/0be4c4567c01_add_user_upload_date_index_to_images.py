@@ -0,0 +1,30 @@
+"""Add (user_id, upload_date) index to images table
+
+Revision ID: 0be4c4567c01
+Revises: b42bee85162f
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0be4c4567c01'
+down_revision = 'b42bee85162f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_images_user_id_upload_date',
+            ['user_id', sa.text('upload_date DESC')],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.drop_index('ix_images_user_id_upload_date')
@@ -0,0 +1,27 @@
+"""Add analysis_status column to images table
+
+Revision ID: 5d0e7c91a2f4
+Revises: 0be4c4567c01
+Create Date: 2026-10-15 14:03:27.529610
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0e7c91a2f4'
+down_revision = '0be4c4567c01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing images were analyzed synchronously at upload time
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_status', sa.String(length=20), nullable=False, server_default='complete'))
+
+
+def downgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.drop_column('analysis_status')
@@ -0,0 +1,29 @@
+"""Add analysis_started_at column to images table
+
+Revision ID: 8c3f1a6b9d27
+Revises: 5d0e7c91a2f4
+Create Date: 2026-10-15 22:10:41.218904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3f1a6b9d27'
+down_revision = '5d0e7c91a2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Left NULL for existing rows; a pending row without it is treated as stale
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_started_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_images_analysis_status_started_at', ['analysis_status', 'analysis_started_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.drop_index('ix_images_analysis_status_started_at')
+        batch_op.drop_column('analysis_started_at')
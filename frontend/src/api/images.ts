@@ -1,5 +1,5 @@
 import apiClient from "./client";
-import { Image } from "../types";
+import { Image, ImageAnalysis } from "../types";
 import { AxiosResponse } from "axios";
 
 /**
@@ -20,6 +20,18 @@ export const getImage = async (imageId: number): Promise<Image> => {
   return response.data;
 };
 
+/**
+ * Get the AI analysis state of an image, for polling after an upload
+ */
+export const getImageAnalysis = async (
+  imageId: number
+): Promise<ImageAnalysis> => {
+  const response: AxiosResponse<ImageAnalysis> = await apiClient.get(
+    `/images/${imageId}/analysis`
+  );
+  return response.data;
+};
+
 /**
  * Upload a new image
  * @param file The image file to upload
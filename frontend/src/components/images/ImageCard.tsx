@@ -50,6 +50,16 @@ const ImageCard: React.FC<ImageCardProps> = ({ image }) => {
                 >
                     {image.original_filename}
                 </div>
+                {image.analysis_status === "pending" && (
+                    <div style={{ fontSize: "0.93em", color: "#888", marginTop: 4 }}>
+                        Analyzing image…
+                    </div>
+                )}
+                {image.analysis_status === "failed" && (
+                    <div style={{ fontSize: "0.93em", color: "#b00", marginTop: 4 }}>
+                        Analysis failed
+                    </div>
+                )}
                 {image.ai_description && (
                     <div
                         style={{
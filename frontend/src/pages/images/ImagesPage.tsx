@@ -1,8 +1,10 @@
 import React, { useEffect, useState } from "react";
-import { getUserImages } from "../../api/images";
+import { getImageAnalysis, getUserImages } from "../../api/images";
 import { Image } from "../../types";
 import ImageGrid from "../../components/images/ImageGrid";
 
+const ANALYSIS_POLL_INTERVAL_MS = 2000;
+
 const ImagesPage: React.FC = () => {
     const [images, setImages] = useState<Image[]>([]);
     const [loading, setLoading] = useState(true);
@@ -23,6 +25,37 @@ const ImagesPage: React.FC = () => {
         fetchImages();
     }, []);
 
+    // Uploads are analyzed in the background; poll until every analysis settles
+    useEffect(() => {
+        const pending = images.filter(img => img.analysis_status === "pending");
+        if (pending.length === 0) return;
+
+        const timer = setTimeout(async () => {
+            try {
+                const results = await Promise.all(
+                    pending.map(img => getImageAnalysis(img.id))
+                );
+                const byId = new Map(results.map(result => [result.id, result]));
+                setImages(current =>
+                    current.map(img => {
+                        const result = byId.get(img.id);
+                        return result
+                            ? {
+                                  ...img,
+                                  analysis_status: result.analysis_status,
+                                  ai_description: result.ai_description ?? undefined,
+                              }
+                            : img;
+                    })
+                );
+            } catch (err) {
+                // Leave the images pending; the next poll retries
+                setImages(current => [...current]);
+            }
+        }, ANALYSIS_POLL_INTERVAL_MS);
+        return () => clearTimeout(timer);
+    }, [images]);
+
     if (loading) return <div>Loading images...</div>;
     if (error) return <div className="text-error">{error}</div>;
 
@@ -32,6 +32,7 @@ const UploadImage = () => {
                 return;
             }
             await uploadImage(file);
+            // The analysis runs in the background; the images page polls for it
             navigate('/images');
         } catch (err: any) {
             setError(err?.response?.data?.errors || 'Image upload failed.');
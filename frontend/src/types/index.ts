@@ -15,9 +15,18 @@ export interface Image {
   file_size: number;
   file_type: string;
   ai_description?: string;
+  analysis_status?: AnalysisStatus;
   user_id: number;
 }
 
+export type AnalysisStatus = "pending" | "complete" | "failed";
+
+export interface ImageAnalysis {
+  id: number;
+  analysis_status: AnalysisStatus;
+  ai_description?: string | null;
+}
+
 export interface AuthResponse {
   user: User;
   access_token: string;